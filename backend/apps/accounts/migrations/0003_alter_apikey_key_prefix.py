@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='apikey',
+            name='key_prefix',
+            field=models.CharField(max_length=12, unique=True),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.15 on 2026-10-16 09:40
+
+from django.db import migrations, models
+
+
+def hex_to_digest(apps, schema_editor):
+    ApiKey = apps.get_model("accounts", "ApiKey")
+    for api_key in ApiKey.objects.only("id", "key_hash").iterator():
+        api_key.key_digest = bytes.fromhex(api_key.key_hash)
+        api_key.save(update_fields=["key_digest"])
+
+
+def digest_to_hex(apps, schema_editor):
+    ApiKey = apps.get_model("accounts", "ApiKey")
+    for api_key in ApiKey.objects.only("id", "key_digest").iterator():
+        api_key.key_hash = bytes(api_key.key_digest).hex()
+        api_key.save(update_fields=["key_hash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_alter_apikey_key_prefix'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='apikey',
+            name='key_hash',
+            field=models.CharField(max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name='apikey',
+            name='key_digest',
+            field=models.BinaryField(max_length=32, null=True),
+        ),
+        migrations.RunPython(hex_to_digest, digest_to_hex),
+        migrations.RemoveField(
+            model_name='apikey',
+            name='key_hash',
+        ),
+        migrations.RenameField(
+            model_name='apikey',
+            old_name='key_digest',
+            new_name='key_hash',
+        ),
+        migrations.AlterField(
+            model_name='apikey',
+            name='key_hash',
+            field=models.BinaryField(max_length=32, unique=True),
+        ),
+    ]
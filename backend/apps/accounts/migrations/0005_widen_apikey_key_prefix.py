@@ -0,0 +1,26 @@
+# Generated by Django 5.1.15 on 2026-10-16 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Widen key_prefix to "oms_" + 16 hex characters.
+
+    Existing rows keep their prefix. Keys created since 0003 carry the first
+    12 characters of the key; keys created before it carry a random prefix
+    that cannot be rebuilt from the stored hash. validate_api_key falls back
+    to the unique key_hash index when the prefix lookup misses, so both kinds
+    keep validating without reissuing them.
+    """
+
+    dependencies = [
+        ('accounts', '0004_apikey_binary_key_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='apikey',
+            name='key_prefix',
+            field=models.CharField(max_length=20, unique=True),
+        ),
+    ]
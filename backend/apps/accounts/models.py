@@ -2,8 +2,12 @@
 User models for the accounts app.
 """
 
+import hashlib
+import secrets
 import uuid
+from functools import cached_property
 
+from django.core.cache import cache
 from django.db import models
 from django.utils import timezone
 
@@ -13,13 +17,18 @@ from apps.core.models import BaseModel
 class ApiKey(BaseModel):
     """API key for machine-to-machine authentication."""
 
+    # Length of the public, indexed prefix taken from the front of the full key:
+    # "oms_" plus 16 hex characters (64 random bits), so prefixes stay unique
+    # far beyond any realistic number of keys
+    KEY_PREFIX_LENGTH = 20
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(
         "core.User", on_delete=models.CASCADE, related_name="api_keys"
     )
     name = models.CharField(max_length=100)
-    key_prefix = models.CharField(max_length=8, unique=True)
-    key_hash = models.CharField(max_length=128)  # SHA256 hash of the full key
+    key_prefix = models.CharField(max_length=KEY_PREFIX_LENGTH, unique=True)
+    key_hash = models.BinaryField(max_length=32, unique=True)  # Raw SHA-256 digest
     scopes = models.JSONField(default=list)  # List of permission scopes
     is_active = models.BooleanField(default=True)
     last_used_at = models.DateTimeField(blank=True, null=True)
@@ -40,20 +49,25 @@ class ApiKey(BaseModel):
         """Check if API key is expired."""
         return bool(self.expires_at and self.expires_at < timezone.now())
 
+    @cached_property
+    def scopes_set(self) -> frozenset:
+        """Scopes as a set for O(1) membership checks."""
+        return frozenset(self.scopes or ())
+
     def has_scope(self, scope: str) -> bool:
         """Check if API key has the specified scope."""
         if not self.is_active or self.is_expired():
             return False
 
-        # Check if scope is in the scopes list
-        return scope in self.scopes
+        # Check if scope is in the scopes set
+        return scope in self.scopes_set
 
     def has_any_scope(self, scopes: list) -> bool:
         """Check if API key has any of the specified scopes."""
         if not self.is_active or self.is_expired():
             return False
 
-        return any(scope in self.scopes for scope in scopes)
+        return not self.scopes_set.isdisjoint(scopes)
 
     def get_full_key(self):
         """Get the full API key (only available during creation)."""
@@ -66,26 +80,25 @@ class ApiKey(BaseModel):
         """Override save to generate key if not provided."""
         if not self.key_prefix:
             # Generate a unique key prefix
-            import secrets
-
-            self.key_prefix = f"oms_{secrets.token_hex(4)}"
+            self.key_prefix = f"oms_{secrets.token_hex(8)}"
 
+        # Scopes may have changed since scopes_set was computed
+        self.__dict__.pop("scopes_set", None)
         super().save(*args, **kwargs)
 
     @classmethod
     def create_with_key(cls, **kwargs):
         """Create API key with generated full key."""
-        import hashlib
-        import secrets
-
         # Generate the full key
         full_key = f"oms_{secrets.token_hex(32)}"
 
         # Create hash for storage
-        key_hash = hashlib.sha256(full_key.encode()).hexdigest()
+        key_hash = hashlib.sha256(full_key.encode()).digest()
 
-        # Create the instance
+        # Create the instance; the prefix is derived from the full key so that
+        # validation can look the row up by its unique index
         instance = cls(**kwargs)
+        instance.key_prefix = full_key[: cls.KEY_PREFIX_LENGTH]
         instance.key_hash = key_hash
 
         # Store the full key temporarily for return
@@ -99,6 +112,9 @@ class ApiKey(BaseModel):
 class UserSession(BaseModel):
     """User session tracking for security."""
 
+    # Seconds between persisted last_activity updates for a session
+    ACTIVITY_THROTTLE = 30
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(
         "core.User", on_delete=models.CASCADE, related_name="sessions"
@@ -120,6 +136,10 @@ class UserSession(BaseModel):
         return f"Session {self.session_key} for {self.user.email}"
 
     def update_activity(self):
-        """Update last activity timestamp."""
+        """Update last activity timestamp, at most once per throttle window."""
+        if not cache.add(
+            f"sess:act:{self.session_key}", 1, timeout=self.ACTIVITY_THROTTLE
+        ):
+            return
         self.last_activity = timezone.now()
-        self.save(update_fields=["last_activity"])
+        UserSession.objects.filter(pk=self.pk).update(last_activity=self.last_activity)
@@ -4,6 +4,8 @@ Repository implementations for accounts app using DjangoRepository.
 
 from typing import Any
 
+from django.utils import timezone
+
 from apps.api.base import DjangoRepository
 from apps.core.models import User
 
@@ -14,16 +16,10 @@ class UserRepository(DjangoRepository[User]):
     """Repository for user data access operations."""
 
     def get_by_email(self, email: str) -> User | None:
-        try:
-            return self.model.objects.get(email=email)
-        except self.model.DoesNotExist:
-            return None
+        return self.model.objects.filter(email=email).first()
 
     def get_by_username(self, username: str) -> User | None:
-        try:
-            return self.model.objects.get(username=username)
-        except self.model.DoesNotExist:
-            return None
+        return self.model.objects.filter(username=username).first()
 
     def exists_with_email(self, email: str) -> bool:
         return self.model.objects.filter(email=email).exists()
@@ -35,31 +31,48 @@ class UserRepository(DjangoRepository[User]):
 class ApiKeyRepository(DjangoRepository[ApiKey]):
     """Repository for API key operations."""
 
-    def get_active_by_hash(self, key_hash: str) -> ApiKey | None:
-        try:
-            return self.model.objects.get(key_hash=key_hash, is_active=True)
-        except self.model.DoesNotExist:
-            return None
+    def get_active_by_hash(self, key_hash: bytes) -> ApiKey | None:
+        return self.model.objects.filter(key_hash=key_hash, is_active=True).first()
 
-    def list_for_user(self, tenant_id: str, user: User):
-        return self.model.objects.filter(
-            user=user,
-            is_active=True,
-        ).order_by("-created_at")
+    def get_active_by_prefix_light(self, key_prefix: str) -> dict[str, Any] | None:
+        """Scalar auth fields for an active key, without building a model."""
+        return (
+            self.model.objects.filter(key_prefix=key_prefix, is_active=True)
+            .values("id", "user_id", "key_hash", "scopes", "expires_at")
+            .first()
+        )
 
-    def soft_delete(self, api_key_id: str, tenant_id: str, user: User) -> bool:
-        try:
-            api_key = self.model.objects.get(
-                id=api_key_id,
-                user=user,
-                is_active=True,
+    def get_active_by_hash_light(self, key_hash: bytes) -> dict[str, Any] | None:
+        """Scalar auth fields for an active key looked up by its digest."""
+        return (
+            self.model.objects.filter(key_hash=key_hash, is_active=True)
+            .values("id", "user_id", "key_hash", "scopes", "expires_at")
+            .first()
+        )
+
+    def list_for_user(self, tenant_id: str, user: User):
+        """Active keys for a user as dicts, newest first, without building models."""
+        return (
+            self.model.objects.filter(user=user, is_active=True)
+            .order_by("-created_at")
+            .values(
+                "id",
+                "name",
+                "key_prefix",
+                "scopes",
+                "expires_at",
+                "created_at",
+                "last_used_at",
             )
-        except self.model.DoesNotExist:
-            return False
+        )
 
-        api_key.is_active = False
-        api_key.save(update_fields=["is_active", "updated_at"])
-        return True
+    def soft_delete(self, api_key_id: str, tenant_id: str, user: User) -> bool:
+        updated = self.model.objects.filter(
+            id=api_key_id,
+            user=user,
+            is_active=True,
+        ).update(is_active=False, updated_at=timezone.now())
+        return bool(updated)
 
     def create_with_key(self, data: dict[str, Any]) -> ApiKey:
         """Create API key using model's secure helper and return model instance.
@@ -72,3 +85,7 @@ class ApiKeyRepository(DjangoRepository[ApiKey]):
             scopes=data.get("scopes") or [],
             expires_at=data.get("expires_at"),
         )
+
+
+# Repositories hold no per-request state; share one instance per process
+api_key_repository = ApiKeyRepository(ApiKey)
@@ -2,18 +2,88 @@
 Authentication services for the accounts app.
 """
 
-import hashlib
+import hmac
 import secrets
+import time
+from hashlib import sha256 as _sha256
+from typing import Any
 
+from django.conf import settings
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 
 from apps.core.models import User
+from apps.core.redis_client import get_default_redis
 
 from .models import ApiKey
-from .repositories import ApiKeyRepository, UserRepository
+from .repositories import api_key_repository
+
+# Compared against when no key matches the prefix so both paths cost the same
+_DUMMY_KEY_HASH = _sha256(b"").digest()
+
+# Validated keys are cached briefly so repeat calls skip the hash + DB lookup
+API_KEY_CACHE_TIMEOUT = 60
+# Redis hash of api_key_id -> last used epoch, flushed to the DB periodically
+API_KEY_LAST_USED_HASH = "apk:lu"
+# Without Redis, last_used_at is written at most once per key in this window
+API_KEY_LAST_USED_DEBOUNCE = 30
+# hash_and_save_password retries failed saves with exponential backoff
+# (Celery's retry_backoff: 10s, 20s, 40s, ..., capped at 10 minutes)
+PASSWORD_HASH_MAX_RETRIES = 8
+PASSWORD_HASH_RETRY_BACKOFF = 10
+PASSWORD_HASH_RETRY_BACKOFF_MAX = 600
+# Longest a failing hash_and_save_password keeps retrying
+PASSWORD_HASH_RETRY_WINDOW = sum(
+    min(PASSWORD_HASH_RETRY_BACKOFF * 2**attempt, PASSWORD_HASH_RETRY_BACKOFF_MAX)
+    for attempt in range(PASSWORD_HASH_MAX_RETRIES)
+)
+# Seconds a staged password waits for its hashing task: the broker's
+# visibility timeout (a task a dead worker held is redelivered within it)
+# plus the retry window. A task that still finds it gone fails loudly
+STAGED_PASSWORD_TTL = (
+    getattr(settings, "CELERY_BROKER_TRANSPORT_OPTIONS", {}).get(
+        "visibility_timeout", 3600
+    )
+    + PASSWORD_HASH_RETRY_WINDOW
+)
+
+
+def staged_password_key(ref: str) -> str:
+    return f"pwstage:{ref}"
+
+
+def _enqueue_password_hash(user_id: str, raw_password: str) -> None:
+    """Queue hashing of a password without putting it in the task arguments.
+
+    Task arguments are persisted by the broker and can surface in result and
+    monitoring backends, so the password is staged in the cache under a
+    random reference that the task deletes once the hash is saved.
+    """
+    from .tasks import hash_and_save_password
+
+    ref = secrets.token_urlsafe(16)
+    cache.set(staged_password_key(ref), raw_password, STAGED_PASSWORD_TTL)
+    hash_and_save_password.delay(user_id, ref)
+
+
+def _api_key_cache_key(key_bytes: bytes) -> str:
+    """Cache key for a presented API key, peppered so raw keys never hit Redis."""
+    digest = hmac.new(settings.API_KEY_SECRET.encode(), key_bytes, _sha256).hexdigest()
+    return f"apk:{digest[:32]}"
+
+
+def _record_api_key_use(api_key_id) -> None:
+    """Record API key usage; flushed by `flush_api_key_last_used`."""
+    redis = get_default_redis()
+    if redis is not None:
+        redis.hset(API_KEY_LAST_USED_HASH, str(api_key_id), int(time.time()))
+    elif cache.add(f"apk:lu:{api_key_id}", 1, timeout=API_KEY_LAST_USED_DEBOUNCE):
+        # No Redis (LocMem): debounced direct write
+        ApiKey.objects.filter(pk=api_key_id).update(last_used_at=timezone.now())
 
 
 class AuthService:
@@ -48,17 +118,62 @@ class AuthService:
         except ValidationError as e:
             raise ValidationError(f"Password validation failed: {e}")
 
-        # Check if user already exists
-        if UserRepository(User).exists_with_email(email):
+        # Create user; the unique constraint on email rejects duplicates in the
+        # same round trip instead of a separate existence check
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    email=email,
+                    password=password,
+                    first_name=first_name,
+                    last_name=last_name,
+                )
+        except IntegrityError:
             raise ValidationError("Email already exists")
 
-        # Create user
-        user = User.objects.create_user(
-            email=email, password=password, first_name=first_name, last_name=last_name
-        )
-
         return user
 
+    @staticmethod
+    def bulk_create_users(users: list[dict[str, Any]]) -> list[User]:
+        """Create many users at once, hashing their passwords in Celery workers.
+
+        Each entry needs email and password, and may carry first_name and
+        last_name. Users are inserted with an unusable password in one
+        statement; `hash_and_save_password` then sets the real hash so the
+        request thread never runs the password hasher.
+        """
+        for entry in users:
+            try:
+                validate_password(entry["password"])
+            except ValidationError as e:
+                raise ValidationError(
+                    f"Password validation failed for {entry['email']}: {e}"
+                )
+
+        instances = []
+        for entry in users:
+            user = User(
+                email=User.objects.normalize_email(entry["email"]).lower(),
+                first_name=entry.get("first_name", ""),
+                last_name=entry.get("last_name", ""),
+            )
+            user.set_unusable_password()
+            instances.append(user)
+
+        try:
+            with transaction.atomic():
+                created = User.objects.bulk_create(instances)
+                for user, entry in zip(created, users, strict=True):
+                    transaction.on_commit(
+                        lambda uid=str(user.id), pw=entry["password"]: (
+                            _enqueue_password_hash(uid, pw)
+                        )
+                    )
+        except IntegrityError:
+            raise ValidationError("One or more emails already exist")
+
+        return created
+
     @staticmethod
     def change_password(user: User, current_password: str, new_password: str) -> bool:
         """Change user password with validation."""
@@ -97,16 +212,52 @@ class AuthService:
         return api_key
 
     @staticmethod
-    def validate_api_key(key: str) -> ApiKey | None:
-        """Validate API key and return associated user."""
-        # Hash the provided key
-        key_hash = hashlib.sha256(key.encode()).hexdigest()
-        repo = ApiKeyRepository(ApiKey)
-        api_key = repo.get_active_by_hash(key_hash)
-        if not api_key or api_key.is_expired():
+    def validate_api_key(key: str) -> dict[str, Any] | None:
+        """Validate API key and return its id, user_id, scopes and expires_at.
+
+        ids are strings and expires_at is epoch seconds (or None).
+        """
+        key_bytes = key.encode()
+        cache_key = _api_key_cache_key(key_bytes)
+        api_key = cache.get(cache_key)
+
+        if api_key is None:
+            # Look the key up by its indexed prefix, then verify the hash in
+            # constant time instead of matching the hash inside the database
+            api_key = api_key_repository.get_active_by_prefix_light(
+                key[: ApiKey.KEY_PREFIX_LENGTH]
+            )
+            key_hash = _sha256(key_bytes).digest()
+            if api_key is None:
+                # Keys issued before prefixes were derived from the key carry
+                # a random prefix; they are still found through the unique
+                # hash index
+                api_key = api_key_repository.get_active_by_hash_light(key_hash)
+            # Some drivers return bytea as memoryview
+            stored_hash = bytes(api_key.pop("key_hash")) if api_key else _DUMMY_KEY_HASH
+            if not hmac.compare_digest(stored_hash, key_hash):
+                return None
+            if not api_key:
+                return None
+            # JSON-safe values, so a cache hit returns the same types as a miss
+            expires_at = api_key["expires_at"]
+            api_key = {
+                "id": str(api_key["id"]),
+                "user_id": str(api_key["user_id"]),
+                "scopes": api_key["scopes"],
+                "expires_at": int(expires_at.timestamp()) if expires_at else None,
+            }
+            cache.set(cache_key, api_key, timeout=API_KEY_CACHE_TIMEOUT)
+            cache.set(
+                f"apk:id:{api_key['id']}", cache_key, timeout=API_KEY_CACHE_TIMEOUT
+            )
+
+        expires_at = api_key["expires_at"]
+        if expires_at is not None and expires_at < time.time():
             return None
-        api_key.last_used_at = timezone.now()
-        api_key.save(update_fields=["last_used_at"])
+
+        # Keep the auth path read-only; last_used_at is flushed in batches
+        _record_api_key_use(api_key["id"])
         return api_key
 
     @staticmethod
@@ -114,8 +265,17 @@ class AuthService:
         """Revoke an API key."""
         api_key.is_active = False
         api_key.save(update_fields=["is_active", "updated_at"])
+        AuthService.invalidate_api_key_cache(api_key.id)
         return True
 
+    @staticmethod
+    def invalidate_api_key_cache(api_key_id) -> None:
+        """Drop any cached validation result for an API key."""
+        id_key = f"apk:id:{api_key_id}"
+        cache_key = cache.get(id_key)
+        if cache_key:
+            cache.delete_many([cache_key, id_key])
+
     @staticmethod
     def generate_password_reset_token(user: User) -> str:
         """Generate password reset token."""
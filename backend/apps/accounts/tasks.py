@@ -0,0 +1,106 @@
+import logging
+from datetime import UTC, datetime
+
+from celery import shared_task
+from django.core.cache import cache
+from django.db import DatabaseError
+from redis.exceptions import RedisError, ResponseError
+
+from apps.accounts.models import ApiKey
+from apps.accounts.services import (
+    API_KEY_LAST_USED_HASH,
+    PASSWORD_HASH_MAX_RETRIES,
+    PASSWORD_HASH_RETRY_BACKOFF,
+    PASSWORD_HASH_RETRY_BACKOFF_MAX,
+    staged_password_key,
+)
+from apps.core.models import User
+from apps.core.redis_client import get_default_redis
+
+logger = logging.getLogger(__name__)
+
+# Seconds a flush may hold its lock before another run can take over
+FLUSH_LOCK_TIMEOUT = 300
+
+
+def _drain_last_used(redis, key: str) -> int:
+    """Write the timestamps buffered under `key`, then drop the hash.
+
+    The hash is only deleted once the UPDATE has succeeded, so a failed run
+    leaves it for the next one instead of losing the timestamps.
+    """
+    entries = redis.hgetall(key)
+    api_keys = [
+        ApiKey(
+            id=api_key_id.decode(),
+            last_used_at=datetime.fromtimestamp(int(ts), UTC),
+        )
+        for api_key_id, ts in entries.items()
+    ]
+    if api_keys:
+        ApiKey.objects.bulk_update(api_keys, ["last_used_at"], batch_size=500)
+    redis.delete(key)
+    return len(api_keys)
+
+
+@shared_task(name="apps.accounts.tasks.flush_api_key_last_used")
+def flush_api_key_last_used():
+    """Flush buffered API key last_used_at timestamps in a single UPDATE."""
+    redis = get_default_redis()
+    if redis is None:
+        # No Redis (LocMem): uses are written directly, nothing is buffered
+        return 0
+    flushing_key = f"{API_KEY_LAST_USED_HASH}:flushing"
+
+    # Overlapping runs (a slow flush outlasting the beat interval) would
+    # delete each other's :flushing hash; the later run simply skips
+    lock = redis.lock(f"{API_KEY_LAST_USED_HASH}:lock", timeout=FLUSH_LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        return 0
+    try:
+        # A hash left aside by a crashed run is written first; the rename
+        # below would otherwise overwrite it
+        flushed = _drain_last_used(redis, flushing_key)
+
+        # Move the hash aside atomically so uses recorded during the flush
+        # are kept
+        try:
+            redis.rename(API_KEY_LAST_USED_HASH, flushing_key)
+        except ResponseError:
+            # No uses recorded since the last flush
+            pass
+        else:
+            flushed += _drain_last_used(redis, flushing_key)
+    finally:
+        lock.release()
+
+    logger.info(f"Flushed last_used_at for {flushed} API keys")
+    return flushed
+
+
+@shared_task(
+    name="apps.accounts.tasks.hash_and_save_password",
+    autoretry_for=(DatabaseError, RedisError),
+    max_retries=PASSWORD_HASH_MAX_RETRIES,
+    retry_backoff=PASSWORD_HASH_RETRY_BACKOFF,
+    retry_backoff_max=PASSWORD_HASH_RETRY_BACKOFF_MAX,
+)
+def hash_and_save_password(user_id: str, password_ref: str):
+    """Hash a user's staged password off the request thread and store it.
+
+    The staged password is deleted only after the hash is saved, so a failed
+    save is retried with the password still available.
+    """
+    key = staged_password_key(password_ref)
+    raw_password = cache.get(key)
+    if raw_password is None:
+        # The user was created with an unusable password and cannot log in
+        # until it is reset; fail the task so this is reported, not skipped
+        raise RuntimeError(
+            f"Staged password for user {user_id} expired before it was hashed"
+        )
+
+    user = User.objects.only("id", "password").get(pk=user_id)
+    user.set_password(raw_password)
+    user.save(update_fields=["password"])
+    cache.delete(key)
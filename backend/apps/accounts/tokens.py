@@ -0,0 +1,88 @@
+"""
+HS256 JSON Web Token encoding and verification.
+
+A specialised replacement for jwt.encode/jwt.decode on the auth hot path:
+the header is fixed, the payload is serialised with orjson and signed with
+hmac directly. Errors are raised as PyJWT exception types so callers can
+keep catching jwt.InvalidTokenError.
+"""
+
+import base64
+import binascii
+import calendar
+import hashlib
+import hmac
+import time
+from datetime import datetime
+
+import jwt
+import orjson
+
+# base64url('{"alg":"HS256","typ":"JWT"}'), byte-identical to PyJWT's header
+_HEADER = b"eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9"
+
+# Registered claims that hold NumericDate values
+_TIME_CLAIMS = ("exp", "iat", "nbf")
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+def encode_hs256(payload: dict, key: bytes) -> str:
+    """Encode and sign a payload as an HS256 JWT."""
+    for claim in _TIME_CLAIMS:
+        value = payload.get(claim)
+        if isinstance(value, datetime):
+            # Same conversion as PyJWT: naive datetimes are taken as UTC
+            payload = {**payload, claim: calendar.timegm(value.utctimetuple())}
+
+    signing_input = _HEADER + b"." + _b64encode(orjson.dumps(payload))
+    signature = hmac.new(key, signing_input, hashlib.sha256).digest()
+    return (signing_input + b"." + _b64encode(signature)).decode("ascii")
+
+
+def decode_hs256(token: str, key: bytes, require: tuple[str, ...] = ()) -> dict:
+    """Verify an HS256 JWT and return its payload.
+
+    The signature is always checked with HS256 whatever the header claims,
+    and an `exp` claim in the past raises jwt.ExpiredSignatureError. Claims
+    named in `require` must be present, as with PyJWT's "require" option.
+    """
+    try:
+        header_b64, payload_b64, signature_b64 = token.encode("ascii").split(b".")
+        signature = _b64decode(signature_b64)
+    except (ValueError, binascii.Error) as e:
+        raise jwt.DecodeError("Malformed token") from e
+
+    expected = hmac.new(key, header_b64 + b"." + payload_b64, hashlib.sha256)
+    if not hmac.compare_digest(signature, expected.digest()):
+        raise jwt.InvalidSignatureError("Signature verification failed")
+
+    try:
+        if header_b64 != _HEADER:
+            header = orjson.loads(_b64decode(header_b64))
+            if not isinstance(header, dict) or header.get("alg") != "HS256":
+                raise jwt.InvalidAlgorithmError(
+                    "The specified alg value is not allowed"
+                )
+        payload = orjson.loads(_b64decode(payload_b64))
+    except (orjson.JSONDecodeError, binascii.Error, ValueError) as e:
+        raise jwt.DecodeError("Invalid token payload") from e
+    if not isinstance(payload, dict):
+        raise jwt.DecodeError("Invalid token payload")
+    for claim in require:
+        if claim not in payload:
+            raise jwt.MissingRequiredClaimError(claim)
+
+    exp = payload.get("exp")
+    if exp is not None:
+        if not isinstance(exp, int | float):
+            raise jwt.DecodeError("Expiration Time claim (exp) must be a number")
+        if exp <= time.time():
+            raise jwt.ExpiredSignatureError("Signature has expired")
+    return payload
@@ -2,12 +2,57 @@
 API app configuration.
 """
 
+import atexit
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
 from django.apps import AppConfig
 
 
+class DeferredQueueHandler(QueueHandler):
+    """Queue handler that leaves formatting to the listener thread.
+
+    The stock handler formats the message and traceback before enqueueing;
+    the queue here is in-process, so records can be passed through as-is.
+    """
+
+    def prepare(self, record):
+        return record
+
+
 class ApiConfig(AppConfig):
     """API app configuration."""
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.api"
     verbose_name = "API"
+
+    _log_listener = None
+
+    def ready(self):
+        """Import signals and route API exception logging through a queue."""
+        import apps.api.signals  # noqa: F401
+
+        if ApiConfig._log_listener is not None:
+            return
+
+        from apps.api.exceptions import logger
+
+        # Collect the handlers the logger would otherwise propagate to
+        handlers = []
+        current = logger
+        while current is not None:
+            handlers.extend(current.handlers)
+            if not current.propagate:
+                break
+            current = current.parent
+        if not handlers:
+            return
+
+        log_queue = queue.Queue(-1)
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        logger.handlers = [DeferredQueueHandler(log_queue)]
+        logger.propagate = False
+        listener.start()
+        atexit.register(listener.stop)
+        ApiConfig._log_listener = listener
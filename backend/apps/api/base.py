@@ -2,20 +2,26 @@
 Base classes for clean architecture implementation and API controller decorator.
 """
 
+import base64
 from abc import ABC, abstractmethod
-from collections.abc import Callable
-from functools import wraps
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from functools import lru_cache, wraps
 from typing import TYPE_CHECKING, Any, Generic, TypeVar
 
-from django.apps import apps as django_apps
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.core.paginator import Paginator
 from django.db import models
-from django.db.models import QuerySet
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from apps.core.audit import enqueue_audit_log
 
 from .exceptions import (
     APIError,
     NotFoundAPIError,
+    TenantRequiredError,
     ValidationAPIError,
 )
 
@@ -25,6 +31,65 @@ if TYPE_CHECKING:
 T = TypeVar("T", bound=models.Model)
 
 
+def encode_cursor(created_at: datetime, id: Any) -> str:
+    """Encode an opaque keyset cursor from a row's (created_at, id)."""
+    raw = f"{created_at.isoformat()}|{id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Decode a keyset cursor produced by `encode_cursor`."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, _, id = raw.partition("|")
+        return datetime.fromisoformat(created_at), id
+    except (ValueError, UnicodeDecodeError):
+        raise ValidationAPIError("Invalid pagination cursor")
+
+
+# Static body for unexpected errors; never mutated, so shared across requests
+_INTERNAL_ERROR_RESPONSE = {
+    "error": {
+        "code": 500,
+        "message": "Internal server error",
+        "type": "internal_error",
+    }
+}
+
+
+def _api_error_response(exc: APIError) -> tuple[dict[str, Any], int]:
+    """Build the structured response for an APIError."""
+    code = exc.code
+    return {
+        "error": {"code": code, "message": exc.message, "type": exc.error_type}
+    }, code
+
+
+def _validation_error_response(exc: ValidationError) -> tuple[dict[str, Any], int]:
+    """Build the structured response for a Django ValidationError."""
+    details = getattr(exc, "message_dict", None)
+    return {
+        "error": {
+            "code": 400,
+            "message": "Validation error",
+            "type": "validation_error",
+            "details": details if details is not None else str(exc),
+        }
+    }, 400
+
+
+def require_tenant(request: "HttpRequest") -> str:
+    """Return the request's tenant id, or raise TenantRequiredError (400).
+
+    Meant for views wrapped in `api_controller`, which turns the error into
+    the standard error envelope.
+    """
+    tenant_id = getattr(request, "tenant_id", None)
+    if not tenant_id:
+        raise TenantRequiredError()
+    return tenant_id
+
+
 def api_controller(func: Callable) -> Callable:
     """Decorator to provide consistent auth/tenant injection and error handling.
 
@@ -33,65 +98,29 @@ def api_controller(func: Callable) -> Callable:
     - Catches generic exceptions to avoid leaking internals
     """
 
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        # Ninja passes request as first arg
-        request: HttpRequest = args[0] if args else kwargs.get("request")
+    # The signature is fixed per view, so inspect it once at decoration time
+    wants_user = "user" in func.__code__.co_varnames
+    wants_tenant = "tenant" in func.__code__.co_varnames
 
+    @wraps(func)
+    def wrapper(request: "HttpRequest", *args, **kwargs):
         # Inject user and tenant when function accepts them and request provides
-        if "user" in func.__code__.co_varnames and hasattr(request, "user"):
-            kwargs.setdefault("user", getattr(request, "user", None))
-        if "tenant" in func.__code__.co_varnames:
-            # Try to resolve and inject Tenant instance when possible
-            tenant_value = kwargs.get("tenant")
-            if tenant_value is None:
-                # prefer already attached tenant object
-                tenant_obj = getattr(request, "tenant", None)
-                if tenant_obj is None:
-                    tenant_id_or_sub = getattr(request, "tenant_id", None)
-                    if tenant_id_or_sub:
-                        try:
-                            TenantModel = django_apps.get_model("tenants", "Tenant")
-                            try:
-                                tenant_obj = TenantModel.objects.get(
-                                    id=tenant_id_or_sub
-                                )
-                            except Exception:
-                                tenant_obj = TenantModel.objects.get(
-                                    subdomain=tenant_id_or_sub
-                                )
-                        except Exception:
-                            tenant_obj = None
-                if tenant_obj is not None:
-                    kwargs["tenant"] = tenant_obj
+        if wants_user and hasattr(request, "user"):
+            kwargs.setdefault("user", request.user)
+        if wants_tenant and kwargs.get("tenant") is None:
+            # Tenant is resolved (and cached) once by TenantMiddleware
+            tenant_obj = getattr(request, "tenant", None)
+            if tenant_obj is not None:
+                kwargs["tenant"] = tenant_obj
 
         try:
-            return func(*args, **kwargs)
+            return func(request, *args, **kwargs)
         except APIError as api_err:
-            return {
-                "error": {
-                    "code": api_err.code,
-                    "message": api_err.message,
-                    "type": api_err.error_type,
-                }
-            }, api_err.code
+            return _api_error_response(api_err)
         except ValidationError as e:
-            return {
-                "error": {
-                    "code": 400,
-                    "message": "Validation error",
-                    "type": "validation_error",
-                    "details": e.message_dict if hasattr(e, "message_dict") else str(e),
-                }
-            }, 400
+            return _validation_error_response(e)
         except Exception:
-            return {
-                "error": {
-                    "code": 500,
-                    "message": "Internal server error",
-                    "type": "internal_error",
-                }
-            }, 500
+            return _INTERNAL_ERROR_RESPONSE, 500
 
     return wrapper
 
@@ -143,17 +172,53 @@ class BaseRepository(ABC, Generic[T]):
 class DjangoRepository(BaseRepository[T]):
     """Django ORM implementation of base repository."""
 
+    def __init__(
+        self,
+        model: type[T],
+        select_related: list[str] | None = None,
+        only: list[str] | None = None,
+    ):
+        super().__init__(model)
+        self.select_related = select_related or []
+        self.only_fields = only or []
+        # Resolved once; every read and write consults it
+        self.tenant_scoped = hasattr(model, "tenant_id")
+
+    def scope_to_tenant(self, queryset: QuerySet, tenant_id: str | None) -> QuerySet:
+        """Filter to `tenant_id` when given and the model is tenant-scoped."""
+        if tenant_id and self.tenant_scoped:
+            return queryset.filter(tenant_id=tenant_id)
+        return queryset
+
+    def get_queryset(self) -> QuerySet:
+        """Base queryset with the repository's joins and column projection."""
+        queryset = self.model.objects.all()
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.only_fields:
+            queryset = queryset.only(*self.only_fields)
+        return queryset
+
     def get_by_id(self, id: str, tenant_id: str | None = None) -> T:
         """Get entity by ID with optional tenant filtering."""
         try:
-            queryset = self.model.objects.filter(id=id)
-            if tenant_id and hasattr(self.model, "tenant_id"):
-                queryset = queryset.filter(tenant_id=tenant_id)
+            queryset = self.get_queryset().filter(id=id)
+            queryset = self.scope_to_tenant(queryset, tenant_id)
 
             return queryset.get()
         except ObjectDoesNotExist:
             raise NotFoundAPIError(f"{self.model.__name__} with id {id} not found")
 
+    def get_values_by_id(
+        self, id: str, fields: Sequence[str], tenant_id: str | None = None
+    ) -> dict[str, Any]:
+        """Get one entity as a dict of `fields`, without building a model."""
+        queryset = self.scope_to_tenant(self.model.objects.filter(id=id), tenant_id)
+        row = queryset.values(*fields).first()
+        if row is None:
+            raise NotFoundAPIError(f"{self.model.__name__} with id {id} not found")
+        return row
+
     def list(
         self,
         tenant_id: str | None = None,
@@ -161,13 +226,25 @@ class DjangoRepository(BaseRepository[T]):
         ordering: str | None = None,
         page: int = 1,
         page_size: int = 20,
+        fields: list[str] | None = None,
+        as_values: bool = False,
+        with_count: bool = True,
     ) -> dict[str, Any]:
-        """List entities with pagination and filtering."""
-        queryset = self.model.objects.all()
+        """List entities with pagination and filtering.
+
+        With `as_values`, rows are returned as dicts of `fields` instead of
+        model instances.
+
+        With `with_count`, the page/total_count contract requires a COUNT(*)
+        over the filtered queryset on every call. Without it, one look-ahead
+        row decides `has_next` and the totals are None, so a page costs only
+        its own rows. For large tables prefer `list_with_cursor`, which also
+        avoids the OFFSET scan.
+        """
+        queryset = self.get_queryset()
 
         # Apply tenant filtering
-        if tenant_id and hasattr(self.model, "tenant_id"):
-            queryset = queryset.filter(tenant_id=tenant_id)
+        queryset = self.scope_to_tenant(queryset, tenant_id)
 
         # Apply additional filters
         if filters:
@@ -177,25 +254,83 @@ class DjangoRepository(BaseRepository[T]):
         if ordering:
             queryset = queryset.order_by(ordering)
 
+        # Skip model instantiation for bulk reads
+        if as_values:
+            queryset = queryset.values(*(fields or []))
+
         # Pagination
-        paginator = Paginator(queryset, page_size)
-        page_obj = paginator.get_page(page)
+        if with_count:
+            paginator = Paginator(queryset, page_size)
+            page_obj = paginator.get_page(page)
+            object_list = page_obj.object_list
+            total_count, total_pages = paginator.count, paginator.num_pages
+        else:
+            offset = (page - 1) * page_size
+            object_list = queryset[offset : offset + page_size + 1]
+            total_count = total_pages = None
+
+        # A page is small; a plain fetch avoids a server-side cursor's
+        # DECLARE/FETCH/CLOSE round trips
+        data = list(object_list)
+
+        if with_count:
+            has_next, has_previous = page_obj.has_next(), page_obj.has_previous()
+        else:
+            has_next, has_previous = len(data) > page_size, page > 1
+            data = data[:page_size]
 
         return {
-            "data": list(page_obj.object_list),
+            "data": data,
             "pagination": {
                 "page": page,
                 "page_size": page_size,
-                "total_count": paginator.count,
-                "total_pages": paginator.num_pages,
-                "has_next": page_obj.has_next(),
-                "has_previous": page_obj.has_previous(),
+                "total_count": total_count,
+                "total_pages": total_pages,
+                "has_next": has_next,
+                "has_previous": has_previous,
             },
         }
 
+    def list_with_cursor(
+        self,
+        *,
+        after: str | None = None,
+        page_size: int = 20,
+        filters: dict[str, Any] | None = None,
+        tenant_id: str | None = None,
+    ) -> dict[str, Any]:
+        """List entities with keyset pagination on (created_at, id).
+
+        Fetches one extra row to detect a next page instead of counting the
+        whole table, so cost stays proportional to `page_size`.
+        """
+        queryset = self.get_queryset()
+
+        queryset = self.scope_to_tenant(queryset, tenant_id)
+
+        if filters:
+            queryset = queryset.filter(**filters)
+
+        if after:
+            created_at, last_id = decode_cursor(after)
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=last_id)
+            )
+
+        rows = list(queryset.order_by("-created_at", "-id")[: page_size + 1])
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+
+        return {
+            "data": rows,
+            "next_cursor": (
+                encode_cursor(rows[-1].created_at, rows[-1].id) if has_next else None
+            ),
+        }
+
     def create(self, data: dict[str, Any], tenant_id: str | None = None) -> T:
         """Create new entity."""
-        if tenant_id and hasattr(self.model, "tenant_id"):
+        if tenant_id and self.tenant_scoped:
             data["tenant_id"] = tenant_id
 
         try:
@@ -213,24 +348,50 @@ class DjangoRepository(BaseRepository[T]):
         try:
             for field, value in data.items():
                 setattr(instance, field, value)
-            instance.save()
+            # Write only the changed columns; auto_now fields (updated_at) are
+            # still stamped because they are included explicitly
+            auto_now_fields = [
+                f.name
+                for f in self.model._meta.concrete_fields
+                if getattr(f, "auto_now", False) and f.name not in data
+            ]
+            instance.save(update_fields=[*data.keys(), *auto_now_fields])
             return instance
         except ValidationError as e:
             raise ValidationAPIError(f"Validation error: {e}")
         except Exception as e:
             raise ValidationAPIError(f"Error updating {self.model.__name__}: {e}")
 
+    def update_fields_only(
+        self, id: str, data: dict[str, Any], tenant_id: str | None = None
+    ) -> int:
+        """Update columns with a single UPDATE, skipping fetch, save and signals."""
+        queryset = self.model.objects.filter(id=id)
+        queryset = self.scope_to_tenant(queryset, tenant_id)
+
+        # queryset.update() bypasses auto_now, so stamp updated_at explicitly
+        if hasattr(self.model, "updated_at"):
+            data = {**data, "updated_at": timezone.now()}
+
+        updated = queryset.update(**data)
+        if not updated:
+            raise NotFoundAPIError(f"{self.model.__name__} with id {id} not found")
+        return updated
+
     def delete(self, id: str, tenant_id: str | None = None) -> bool:
         """Delete entity."""
-        instance = self.get_by_id(id, tenant_id)
-        instance.delete()
+        queryset = self.model.objects.filter(id=id)
+        queryset = self.scope_to_tenant(queryset, tenant_id)
+
+        deleted, _ = queryset.delete()
+        if not deleted:
+            raise NotFoundAPIError(f"{self.model.__name__} with id {id} not found")
         return True
 
     def exists(self, id: str, tenant_id: str | None = None) -> bool:
         """Check if entity exists."""
         queryset = self.model.objects.filter(id=id)
-        if tenant_id and hasattr(self.model, "tenant_id"):
-            queryset = queryset.filter(tenant_id=tenant_id)
+        queryset = self.scope_to_tenant(queryset, tenant_id)
         return queryset.exists()
 
 
@@ -257,6 +418,19 @@ class BaseService:
         # TODO: Implement permission validation
         return True
 
+    @staticmethod
+    def audit_enabled(resource_type: str) -> bool:
+        """Whether audit entries for `resource_type` are recorded at all.
+
+        Callers on write paths check this before assembling audit_log
+        arguments, so nothing is built when the entry would be dropped.
+        """
+        if not getattr(settings, "AUDIT_LOG_ENABLED", True):
+            return False
+        return resource_type not in getattr(
+            settings, "AUDIT_LOG_DISABLED_RESOURCE_TYPES", ()
+        )
+
     def audit_log(
         self,
         action: str,
@@ -267,9 +441,20 @@ class BaseService:
         old_values: dict | None = None,
         new_values: dict | None = None,
     ):
-        """Log audit trail for actions."""
-        # TODO: Implement audit logging
-        pass
+        """Queue an audit trail entry; it is written off the request path."""
+        # Skip building the entry at all when auditing is off for this resource
+        if not self.audit_enabled(resource_type):
+            return
+
+        enqueue_audit_log(
+            user_id=user_id,
+            action=action.upper(),
+            resource_type=resource_type,
+            resource_id=resource_id,
+            old_values=old_values,
+            new_values=new_values,
+            metadata={"tenant_id": tenant_id} if tenant_id else None,
+        )
 
 
 class PaginationMixin:
@@ -295,19 +480,49 @@ class PaginationMixin:
         }
 
 
+FilterFn = Callable[[QuerySet, Any], QuerySet]
+
+
+def _compile_filter(field: str) -> FilterFn:
+    """Build the queryset filter closure for a single lookup."""
+    if field.endswith("__in"):
+
+        def apply_in(queryset: QuerySet, value: Any) -> QuerySet:
+            if isinstance(value, str):
+                value = [v.strip() for v in value.split(",")]
+            return queryset.filter(**{field: value})
+
+        return apply_in
+
+    def apply(queryset: QuerySet, value: Any) -> QuerySet:
+        return queryset.filter(**{field: value})
+
+    return apply
+
+
+@lru_cache(maxsize=256)
+def _compile_filter_spec(fields: tuple[str, ...]) -> tuple[tuple[str, FilterFn], ...]:
+    return tuple((field, _compile_filter(field)) for field in fields)
+
+
 class FilterMixin:
     """Mixin for filtering functionality."""
 
+    @staticmethod
+    def compile_filter_spec(spec) -> tuple[tuple[str, FilterFn], ...]:
+        """Compile filter field names into cached (field, filter closure) pairs.
+
+        Lookup-suffix dispatch happens once per distinct spec, so an endpoint
+        with a stable set of filters pays it only on first use.
+        """
+        return _compile_filter_spec(tuple(spec))
+
     def apply_filters(self, queryset: QuerySet, filters: dict[str, Any]) -> QuerySet:
         """Apply filters to queryset."""
-        for field, value in filters.items():
+        for field, apply in self.compile_filter_spec(filters):
+            value = filters[field]
             if value is not None:
-                if field.endswith("__in") and isinstance(value, str):
-                    value = [v.strip() for v in value.split(",")]
-                elif field.endswith("__icontains"):
-                    queryset = queryset.filter(**{field: value})
-                else:
-                    queryset = queryset.filter(**{field: value})
+                queryset = apply(queryset, value)
 
         return queryset
 
@@ -3,14 +3,19 @@ API exception handling for Django Ninja.
 """
 
 import logging
+import sys
+from collections.abc import Callable
 from typing import Any
 
+import orjson
 from django.core.exceptions import PermissionDenied, ValidationError
-from django.http import HttpRequest
+from django.http import HttpRequest, HttpResponse
 from ninja.errors import HttpError
 
 logger = logging.getLogger(__name__)
 
+HEADER_USER_AGENT = sys.intern("User-Agent")
+
 
 class APIExceptionHandler:
     """Centralized exception handling for API endpoints."""
@@ -20,99 +25,34 @@ class APIExceptionHandler:
         """Handle exceptions and return consistent error responses."""
         from django.http import JsonResponse
 
-        # Log the exception
-        logger.error(
-            f"API Exception: {type(exc).__name__}: {str(exc)}",
-            extra={
-                "request_path": request.path,
-                "request_method": request.method,
-                "user_agent": request.headers.get("User-Agent", ""),
-                "ip_address": request.META.get("REMOTE_ADDR", ""),
-            },
-            exc_info=True,
-        )
-
-        # Handle specific exception types
-        data = {"error": {}}
-        status_code = 500
-
-        if isinstance(exc, APIError):
-            status_code = exc.code
-            data = {
-                "error": {
-                    "code": exc.code,
-                    "message": exc.message,
-                    "type": exc.error_type,
-                }
-            }
-            if isinstance(exc, ValidationAPIError) and exc.details:
-                data["error"]["details"] = exc.details
-
-        elif isinstance(exc, HttpError):
-            status_code = exc.status_code
-            data = {
-                "error": {
-                    "code": exc.status_code,
-                    "message": str(exc),
-                    "type": "http_error",
-                }
-            }
-
-        elif isinstance(exc, ValidationError):
-            status_code = 400
-            data = {
-                "error": {
-                    "code": 400,
-                    "message": "Validation error",
-                    "type": "validation_error",
-                    "details": (
-                        exc.message_dict if hasattr(exc, "message_dict") else str(exc)
-                    ),
-                }
-            }
-
-        elif isinstance(exc, PermissionDenied):
-            status_code = 403
-            data = {
-                "error": {
-                    "code": 403,
-                    "message": "Permission denied",
-                    "type": "permission_error",
-                }
-            }
-
-        elif isinstance(exc, ValueError):
-            status_code = 400
-            data = {"error": {"code": 400, "message": str(exc), "type": "value_error"}}
-
-        else:
-            # Handle unexpected exceptions
-            # In production, don't expose internal error details
-            is_debug = False
-            try:
-                from django.conf import settings
-
-                is_debug = getattr(settings, "DEBUG", False)
-            except Exception:
-                pass
-
-            if is_debug:
-                data = {
-                    "error": {
-                        "code": 500,
-                        "message": f"Internal server error: {str(exc)}",
-                        "type": "internal_error",
-                    }
-                }
-            else:
-                data = {
-                    "error": {
-                        "code": 500,
-                        "message": "Internal server error",
-                        "type": "internal_error",
-                    }
-                }
-
+        # Exact type hit first; the MRO walk runs once per exception class
+        exc_type = type(exc)
+        builder = _RESOLVED_BUILDERS.get(exc_type)
+        if builder is None:
+            builder = _resolve_builder(exc_type)
+        status_code, data = builder(exc)
+
+        # Client errors are expected: log them without a traceback
+        level = logging.WARNING if status_code < 500 else logging.ERROR
+        if logger.isEnabledFor(level):
+            logger.log(
+                level,
+                "API Exception: %s: %s",
+                exc_type.__name__,
+                exc,
+                extra={
+                    "request_path": request.path,
+                    "request_method": request.method,
+                    "user_agent": request.headers.get(HEADER_USER_AGENT, ""),
+                    "ip_address": request.META.get("REMOTE_ADDR", ""),
+                },
+                exc_info=level >= logging.ERROR,
+            )
+
+        if isinstance(data, bytes):
+            return HttpResponse(
+                data, status=status_code, content_type="application/json"
+            )
         return JsonResponse(data, status=status_code)
 
 
@@ -134,6 +74,13 @@ class ValidationAPIError(APIError):
         self.details = details or {}
 
 
+class TenantRequiredError(ValidationAPIError):
+    """Raised when an endpoint needs a tenant and the request has none."""
+
+    def __init__(self, message: str = "Tenant context required"):
+        super().__init__(message)
+
+
 class PermissionAPIError(APIError):
     """Permission error for API requests."""
 
@@ -160,3 +107,104 @@ class RateLimitAPIError(APIError):
 
     def __init__(self, message: str = "Rate limit exceeded"):
         super().__init__(message, 429, "rate_limit_error")
+
+
+def _build_api_error(exc: "APIError") -> tuple[int, dict]:
+    data = {
+        "error": {
+            "code": exc.code,
+            "message": exc.message,
+            "type": exc.error_type,
+        }
+    }
+    if isinstance(exc, ValidationAPIError) and exc.details:
+        data["error"]["details"] = exc.details
+    return exc.code, data
+
+
+def _build_http_error(exc: HttpError) -> tuple[int, dict]:
+    return exc.status_code, {
+        "error": {
+            "code": exc.status_code,
+            "message": str(exc),
+            "type": "http_error",
+        }
+    }
+
+
+def _build_validation_error(exc: ValidationError) -> tuple[int, dict]:
+    error = _VALIDATION_ERROR.copy()
+    error["details"] = exc.message_dict if hasattr(exc, "message_dict") else str(exc)
+    return 400, {"error": error}
+
+
+def _build_permission_error(exc: PermissionDenied) -> tuple[int, bytes]:
+    return 403, _PERMISSION_ERROR_BODY
+
+
+def _build_value_error(exc: ValueError) -> tuple[int, dict]:
+    error = _VALUE_ERROR.copy()
+    error["message"] = str(exc)
+    return 400, {"error": error}
+
+
+def _build_internal_error(exc: Exception) -> tuple[int, dict | bytes]:
+    # In production, don't expose internal error details
+    is_debug = False
+    try:
+        from django.conf import settings
+
+        is_debug = getattr(settings, "DEBUG", False)
+    except Exception:
+        pass
+
+    if not is_debug:
+        return 500, _INTERNAL_ERROR_BODY
+    error = _INTERNAL_ERROR.copy()
+    error["message"] = f"Internal server error: {str(exc)}"
+    return 500, {"error": error}
+
+
+# Constant error payloads; variable ones are copied and filled in per call
+_VALIDATION_ERROR = {
+    "code": 400,
+    "message": "Validation error",
+    "type": "validation_error",
+}
+_VALUE_ERROR = {"code": 400, "message": None, "type": "value_error"}
+_INTERNAL_ERROR = {"code": 500, "message": None, "type": "internal_error"}
+_PERMISSION_ERROR_BODY = orjson.dumps(
+    {"error": {"code": 403, "message": "Permission denied", "type": "permission_error"}}
+)
+_INTERNAL_ERROR_BODY = orjson.dumps(
+    {
+        "error": {
+            "code": 500,
+            "message": "Internal server error",
+            "type": "internal_error",
+        }
+    }
+)
+
+_ERROR_BUILDERS = {
+    APIError: _build_api_error,
+    HttpError: _build_http_error,
+    ValidationError: _build_validation_error,
+    PermissionDenied: _build_permission_error,
+    ValueError: _build_value_error,
+}
+
+# Builders keyed by concrete exception type, filled in as new types are seen
+_RESOLVED_BUILDERS = dict(_ERROR_BUILDERS)
+
+
+def _resolve_builder(exc_type: type) -> Callable[[Exception], tuple[int, Any]]:
+    """Find the builder for the nearest handled class in exc_type's MRO."""
+    for cls in exc_type.__mro__:
+        builder = _ERROR_BUILDERS.get(cls)
+        if builder is not None:
+            break
+    else:
+        builder = _build_internal_error
+    _RESOLVED_BUILDERS[exc_type] = builder
+    return builder
@@ -0,0 +1,51 @@
+"""
+Idempotency-key replay protection for non-idempotent endpoints.
+"""
+
+from collections.abc import Callable
+
+from django.core.cache import cache
+from pydantic import BaseModel
+
+from .exceptions import ConflictAPIError
+
+# Seconds a key keeps replaying its first response
+IDEMPOTENCY_TTL = 24 * 60 * 60
+
+# Seconds a claim is held while its request runs; a worker that dies
+# mid-request frees the key after this instead of blocking it for a day
+IN_PROGRESS_TTL = 60
+
+# Placeholder stored while the first request with a key is still running
+_IN_PROGRESS = "__in_progress__"
+
+
+def run_idempotent(
+    scope: str, key: str, func: Callable[[], BaseModel], schema: type[BaseModel]
+) -> BaseModel:
+    """Run `func` once per `scope`/`key` and replay its result afterwards.
+
+    The key is claimed with cache.add (SET NX on Redis), so concurrent
+    duplicates are rejected with a 409 instead of running twice. If `func`
+    raises, the claim is released and the client may retry with the same key.
+
+    `func` returns a `schema` instance. It is cached in its JSON form, which
+    the cache serializer can store, and validated back into `schema` on replay.
+
+    Fresh keys are the common case, so the claim is attempted first; a first
+    request costs one round trip and only replays pay for the extra GET.
+    """
+    cache_key = f"idem:{scope}:{key}"
+    if cache.add(cache_key, _IN_PROGRESS, IN_PROGRESS_TTL):
+        try:
+            result = func()
+        except BaseException:
+            cache.delete(cache_key)
+            raise
+        cache.set(cache_key, result.model_dump(mode="json"), IDEMPOTENCY_TTL)
+        return result
+
+    cached = cache.get(cache_key)
+    if cached is None or cached == _IN_PROGRESS:
+        raise ConflictAPIError("A request with this idempotency key is in progress")
+    return schema.model_validate(cached)
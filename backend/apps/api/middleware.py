@@ -2,10 +2,223 @@
 API middleware for Django Ninja.
 """
 
+import fcntl
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from functools import lru_cache
+from hashlib import blake2b
+from typing import NamedTuple
+
+from django.apps import apps as django_apps
 from django.conf import settings
 from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.http import HttpRequest
 
+from apps.core.localcache import TTLCache
+from apps.core.redis_client import get_default_redis
+
+# Header names and prefixes read on every request
+HEADER_AUTHORIZATION = sys.intern("Authorization")
+HEADER_TENANT_ID = sys.intern("X-Tenant-ID")
+HEADER_FORWARDED_FOR = sys.intern("X-Forwarded-For")
+BEARER_PREFIX = "Bearer "
+_TOKEN_START = len(BEARER_PREFIX)
+
+# Resolved tenants are cached under both their id and subdomain, as plain
+# rows of these fields
+TENANT_CACHE_TIMEOUT = 60
+TENANT_CACHE_FIELDS = ["id", "subdomain", "name"]
+
+# Per-process layer in front of the shared cache, so repeat requests for the
+# same tenant on one worker skip the network round trip entirely
+LOCAL_TENANT_CACHE_SIZE = 1024
+LOCAL_TENANT_CACHE_TTL = 60
+
+# First host labels that never name a tenant
+RESERVED_SUBDOMAINS = frozenset(("www", "api", "localhost", "127"))
+
+_local_tenants = TTLCache(LOCAL_TENANT_CACHE_SIZE, LOCAL_TENANT_CACHE_TTL)
+
+# Paths that never consume rate-limit budget; the API is mounted under /api/
+RATE_LIMIT_EXEMPT_PATHS = frozenset(
+    (
+        "/",
+        "/api/",
+        "/api/health",
+        "/api/health/ready",
+        "/api/version",
+        "/api/openapi.json",
+        "/dashboard/telemetry/",
+    )
+)
+RATE_LIMIT_EXEMPT_PREFIXES = ("/api/docs",)
+
+# Sliding-window rate limit: prune expired hits, count, and record the new hit
+# in one atomic round trip. Returns the remaining budget, or -1 when exceeded.
+RATE_LIMIT_LUA = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, ARGV[1] - ARGV[2])
+local n = redis.call('ZCARD', KEYS[1])
+if n >= tonumber(ARGV[3]) then
+    return -1
+end
+redis.call('ZADD', KEYS[1], ARGV[1], ARGV[1] .. ':' .. math.random())
+redis.call('PEXPIRE', KEYS[1], ARGV[2])
+return ARGV[3] - n - 1
+"""
+
+# Grant up to ARGV[1] hits from the window's global budget of ARGV[2].
+# Returns {granted, total granted so far in this window}.
+RATE_LIMIT_RESERVE_LUA = """
+local used = tonumber(redis.call('GET', KEYS[1]) or '0')
+local grant = math.min(tonumber(ARGV[1]), tonumber(ARGV[2]) - used)
+if grant <= 0 then
+    return {0, used}
+end
+used = redis.call('INCRBY', KEYS[1], grant)
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return {grant, used}
+"""
+
+_scripts = {}
+
+
+def _get_script(client, lua: str):
+    """Register a Lua script once per process."""
+    script = _scripts.get(lua)
+    if script is None:
+        script = _scripts[lua] = client.register_script(lua)
+    return script
+
+
+# Per-process reservations for the "reserved" strategy:
+# key -> [window id, hits used, hits reserved, global total at last grant]
+_reservations: dict[str, list] = {}
+_reservations_lock = threading.Lock()
+MAX_RESERVATIONS = 10_000
+
+
+def invalidate_tenant(tenant_id: str) -> None:
+    """Drop a tenant from this process and the shared cache.
+
+    Other workers keep their local copy until LOCAL_TENANT_CACHE_TTL expires.
+    """
+    _local_tenants.pop(tenant_id)
+    cache.delete_many(
+        [f"tenant_{tenant_id}_info", f"t:id:{tenant_id}", f"t:sub:{tenant_id}"]
+    )
+
+
+@lru_cache(maxsize=1024)
+def _subdomain_from_host(host: str) -> str | None:
+    # Strip the port, then take the first label without splitting the host
+    idx = host.find(":")
+    if idx != -1:
+        host = host[:idx]
+    idx = host.find(".")
+    if idx > 0:
+        subdomain = host[:idx]
+        if subdomain not in RESERVED_SUBDOMAINS:
+            # TODO: Lookup tenant by subdomain
+            return subdomain
+    return None
+
+
+class RateLimitConfig(NamedTuple):
+    limit: int  # requests per window
+    window: int  # seconds
+    strategy: str
+    workers: int
+
+
+@lru_cache(maxsize=1)
+def get_rate_limit_config() -> RateLimitConfig:
+    """Read the rate limit settings once; reset when they are overridden."""
+    return RateLimitConfig(
+        limit=getattr(settings, "API_RATE_LIMIT", 100),
+        window=getattr(settings, "API_RATE_LIMIT_WINDOW", 60),
+        strategy=getattr(settings, "API_RATE_LIMIT_STRATEGY", "sliding"),
+        workers=getattr(settings, "API_RATE_LIMIT_WORKERS", 4),
+    )
+
+
+@receiver(setting_changed)
+def _reset_rate_limit_config(*, setting, **kwargs):
+    if setting.startswith("API_RATE_LIMIT"):
+        get_rate_limit_config.cache_clear()
+
+
+class SharedTokenBucket:
+    """Token buckets in a shared mmap file, for single-host deployments.
+
+    Every worker process on the host maps the same file, so the limit is
+    enforced across gunicorn workers without a cache round trip. Keys are
+    hashed onto a fixed number of slots, and each slot records the hash of
+    the key it holds. A different key hashing to an occupied slot takes it
+    over with a full bucket, so collisions can only loosen the limit, never
+    drain another client's tokens. Each slot is guarded by an fcntl
+    byte-range lock (between processes) and a thread lock (fcntl locks are
+    per process).
+    """
+
+    SLOT = struct.Struct("<QdQ")  # key hash, tokens, last refill (monotonic ms)
+
+    def __init__(self, path: str, slots: int):
+        self.slots = slots
+        size = self.SLOT.size * slots
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, capacity: int, window: int) -> int:
+        """Take one token; return the remaining tokens, or -1 when empty."""
+        key_hash = int.from_bytes(blake2b(key.encode(), digest_size=8).digest())
+        offset = (key_hash % self.slots) * self.SLOT.size
+        refill_per_ms = capacity / (window * 1000)
+
+        with self._lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, self.SLOT.size, offset)
+            try:
+                slot_hash, tokens, last_ms = self.SLOT.unpack_from(self._map, offset)
+                now_ms = time.monotonic_ns() // 1_000_000
+                if slot_hash != key_hash or last_ms == 0 or last_ms > now_ms:
+                    # Unused slot, one held by another key, or stale data
+                    # from before a reboot
+                    tokens = float(capacity)
+                else:
+                    tokens = min(capacity, tokens + (now_ms - last_ms) * refill_per_ms)
+
+                if tokens < 1:
+                    self.SLOT.pack_into(self._map, offset, key_hash, tokens, now_ms)
+                    return -1
+                tokens -= 1
+                self.SLOT.pack_into(self._map, offset, key_hash, tokens, now_ms)
+                return int(tokens)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, self.SLOT.size, offset)
+
+
+_shared_bucket = None
+
+
+def _get_shared_bucket() -> SharedTokenBucket:
+    """Map the shared bucket file once per process (after any fork)."""
+    global _shared_bucket
+    if _shared_bucket is None:
+        _shared_bucket = SharedTokenBucket(
+            settings.API_RATE_LIMIT_SHM_PATH,
+            getattr(settings, "API_RATE_LIMIT_SHM_SLOTS", 4096),
+        )
+    return _shared_bucket
+
 
 class TenantMiddleware:
     """Middleware for tenant resolution and request scoping."""
@@ -20,29 +233,83 @@ class TenantMiddleware:
 
         if tenant_id:
             request.tenant_id = tenant_id
-            # Cache tenant info for performance
-            cache_key = f"tenant_{tenant_id}_info"
-            tenant_info = cache.get(cache_key)
-            if not tenant_info:
-                # TODO: Fetch tenant info from database
-                tenant_info = {"id": tenant_id, "name": "Default Tenant"}
-                cache.set(cache_key, tenant_info, 300)  # 5 minutes
-            request.tenant_info = tenant_info
+            entry = _local_tenants.get(tenant_id)
+            if entry is None:
+                entry = self._load_tenant(tenant_id)
+                _local_tenants.set(tenant_id, entry)
+            request.tenant_info, request.tenant = entry
 
         return self.get_response(request) if self.get_response else None
 
+    def _load_tenant(self, tenant_id: str) -> tuple:
+        """Return (tenant_info, tenant) from the shared cache or the database."""
+        # Fetch tenant info and the resolved tenant in one round trip
+        info_key = f"tenant_{tenant_id}_info"
+        id_key, sub_key = f"t:id:{tenant_id}", f"t:sub:{tenant_id}"
+        cached = cache.get_many([info_key, id_key, sub_key])
+
+        tenant_info = cached.get(info_key)
+        if not tenant_info:
+            # TODO: Fetch tenant info from database
+            tenant_info = {"id": tenant_id, "name": "Default Tenant"}
+            cache.set(info_key, tenant_info, 300)  # 5 minutes
+
+        tenant_row = cached.get(id_key) or cached.get(sub_key)
+        if tenant_row is None:
+            tenant = self._resolve_tenant(tenant_id)
+        else:
+            tenant = self._tenant_from_row(tenant_row)
+        return tenant_info, tenant
+
+    @staticmethod
+    def _tenant_from_row(row: dict):
+        """Rebuild the cached tenant as a model deferring all other fields."""
+        TenantModel = django_apps.get_model("tenants", "Tenant")
+        values = (
+            TenantModel._meta.pk.to_python(row["id"]),
+            row["subdomain"],
+            row["name"],
+        )
+        return TenantModel.from_db("default", TENANT_CACHE_FIELDS, values)
+
+    def _resolve_tenant(self, tenant_id: str):
+        """Load a Tenant by id or subdomain and cache it under both keys."""
+        try:
+            TenantModel = django_apps.get_model("tenants", "Tenant")
+        except LookupError:
+            # Tenancy is optional; without the app there is nothing to resolve
+            return None
+
+        queryset = TenantModel.objects.only(*TENANT_CACHE_FIELDS)
+        try:
+            tenant = queryset.filter(id=tenant_id).first()
+        except (ValueError, ValidationError):
+            tenant = None
+        if tenant is None:
+            tenant = queryset.filter(subdomain=tenant_id).first()
+
+        if tenant is not None:
+            # Plain JSON-safe values; the cache serializer cannot encode models
+            row = {
+                "id": str(tenant.id),
+                "subdomain": tenant.subdomain,
+                "name": tenant.name,
+            }
+            cache.set_many(
+                {f"t:id:{tenant.id}": row, f"t:sub:{tenant.subdomain}": row},
+                TENANT_CACHE_TIMEOUT,
+            )
+        return tenant
+
     def _extract_tenant_id(self, request: HttpRequest) -> str | None:
         """Extract tenant ID from request."""
         # Check subdomain first
-        host = request.get_host()
-        if "." in host:
-            subdomain = host.split(".")[0]
-            if subdomain not in ["www", "api", "localhost", "127"]:
-                # TODO: Lookup tenant by subdomain
-                return subdomain
+        subdomain = _subdomain_from_host(request.get_host())
+        if subdomain:
+            return subdomain
 
         # Check header
-        tenant_header = request.headers.get("X-Tenant-ID")
+        tenant_header = request.headers.get(HEADER_TENANT_ID)
         if tenant_header:
             return tenant_header
 
@@ -62,54 +329,130 @@ class RateLimitMiddleware:
 
     def __call__(self, request: HttpRequest):
         """Process request and apply rate limiting."""
-        # Skip rate limiting for health checks and high-frequency telemetry
-        if request.path in ["/health", "/", "/dashboard/telemetry/"]:
+        # Skip rate limiting for health checks, docs and high-frequency telemetry
+        path = request.path
+        if path in RATE_LIMIT_EXEMPT_PATHS or path.startswith(
+            RATE_LIMIT_EXEMPT_PREFIXES
+        ):
             return self.get_response(request) if self.get_response else None
 
         # Get client identifier
         client_id = self._get_client_id(request)
 
         # Check rate limit
-        if not self._check_rate_limit(client_id, request.path):
+        remaining = self._check_rate_limit(client_id, path)
+        if remaining < 0:
             from ninja.errors import HttpError
 
             raise HttpError(429, "Rate limit exceeded")
+        request.rate_limit_remaining = remaining
 
-        return self.get_response(request) if self.get_response else None
+        response = self.get_response(request) if self.get_response else None
+        if response is not None:
+            response["X-RateLimit-Remaining"] = str(remaining)
+        return response
 
     def _get_client_id(self, request: HttpRequest) -> str:
         """Get unique client identifier for rate limiting."""
         # Use API key if available
-        auth_header = request.headers.get("Authorization", "")
-        if auth_header.startswith("Bearer "):
-            token = auth_header.split(" ")[1]
-            # TODO: Extract user/tenant from JWT token
-            return f"user_{token[:8]}"
+        auth_header = request.headers.get(HEADER_AUTHORIZATION, "")
+        if auth_header.startswith(BEARER_PREFIX):
+            # Every JWT shares its leading characters (the encoded header), so
+            # bucket on a digest of the whole token instead of a prefix
+            token = auth_header[_TOKEN_START:].encode()
+            return "user_" + blake2b(token, digest_size=8).hexdigest()
 
         # Fallback to IP address
-        x_forwarded_for = request.headers.get("X-Forwarded-For")
+        x_forwarded_for = request.headers.get(HEADER_FORWARDED_FOR)
         if x_forwarded_for:
-            ip = x_forwarded_for.split(",")[0].strip()
+            idx = x_forwarded_for.find(",")
+            ip = (x_forwarded_for[:idx] if idx != -1 else x_forwarded_for).strip()
         else:
             ip = request.META.get("REMOTE_ADDR", "unknown")
 
         return f"ip_{ip}"
 
-    def _check_rate_limit(self, client_id: str, endpoint: str) -> bool:
-        """Check if request is within rate limits."""
-        # Get rate limit configuration
-        rate_limit = getattr(settings, "API_RATE_LIMIT", 100)  # requests per minute
-        rate_limit_window = getattr(settings, "API_RATE_LIMIT_WINDOW", 60)  # seconds
+    def _check_rate_limit(self, client_id: str, endpoint: str) -> int:
+        """Record a hit and return the remaining budget, or -1 when exceeded."""
+        rate_limit, rate_limit_window, strategy, _ = get_rate_limit_config()
+        cache_key = f"rl:{client_id}:{endpoint}"
+
+        if strategy == "local":
+            return _get_shared_bucket().consume(
+                cache_key, rate_limit, rate_limit_window
+            )
 
-        # Create cache key
-        cache_key = f"rate_limit_{client_id}_{endpoint}"
+        if strategy == "reserved":
+            return self._check_reserved(cache_key, rate_limit, rate_limit_window)
+
+        client = get_default_redis()
+        if client is None:
+            # No Redis (LocMem): fixed window counter
+            count = self._incr_cache(cache_key, rate_limit_window)
+            return self._remaining(count, rate_limit)
+
+        if strategy == "fixed":
+            # INCR plus EXPIRE NX in one round trip; the TTL is set only by the
+            # first hit so sustained traffic cannot extend the window
+            counter_key = f"rlf:{client_id}:{endpoint}"
+            pipe = client.pipeline(transaction=False)
+            pipe.incr(counter_key)
+            pipe.expire(counter_key, rate_limit_window, nx=True)
+            count, _ = pipe.execute()
+            return self._remaining(count, rate_limit)
+
+        # Wall clock, not monotonic: the window is shared by every host, and
+        # monotonic clocks are only comparable within one machine
+        now_ms = time.time_ns() // 1_000_000
+        window_ms = rate_limit_window * 1000
+        script = _get_script(client, RATE_LIMIT_LUA)
+        return int(script(keys=[cache_key], args=[now_ms, window_ms, rate_limit]))
+
+    def _check_reserved(self, cache_key: str, rate_limit: int, window: int) -> int:
+        """Fixed window served from a local reservation of the global budget.
+
+        Each process claims a slice of the window's budget from Redis and
+        spends it locally, so Redis is only consulted once per slice.
+        Slices still held by other workers count as used, which makes the
+        limit slightly conservative.
+        """
+        window_id = int(time.time()) // window
+        with _reservations_lock:
+            entry = _reservations.get(cache_key)
+            if entry is not None and entry[0] == window_id and entry[1] < entry[2]:
+                entry[1] += 1
+                return rate_limit - entry[3] + entry[2] - entry[1]
+
+        quota = max(1, rate_limit // (get_rate_limit_config().workers * 4))
+        quota_key = f"rlq:{cache_key}:{window_id}"
+        client = get_default_redis()
+        if client is not None:
+            script = _get_script(client, RATE_LIMIT_RESERVE_LUA)
+            granted, total = script(keys=[quota_key], args=[quota, rate_limit, window])
+        else:
+            # No Redis (LocMem): reserve one hit at a time
+            total = self._incr_cache(quota_key, window)
+            granted = 1 if total <= rate_limit else 0
+        if not granted:
+            return -1
 
-        # Get current count
-        current_count = cache.get(cache_key, 0)
+        with _reservations_lock:
+            if len(_reservations) >= MAX_RESERVATIONS:
+                # Drop reservations left over from earlier windows
+                for key in [k for k, v in _reservations.items() if v[0] != window_id]:
+                    del _reservations[key]
+            _reservations[cache_key] = [window_id, 1, granted, total]
+        return rate_limit - total + granted - 1
 
-        if current_count >= rate_limit:
-            return False
+    @staticmethod
+    def _incr_cache(cache_key: str, window: int) -> int:
+        try:
+            return cache.incr(cache_key)
+        except ValueError:
+            # First hit (or the window just expired): start a new window
+            cache.set(cache_key, 1, window)
+            return 1
 
-        # Increment count
-        cache.set(cache_key, current_count + 1, rate_limit_window)
-        return True
+    @staticmethod
+    def _remaining(count: int, rate_limit: int) -> int:
+        return rate_limit - count if count <= rate_limit else -1
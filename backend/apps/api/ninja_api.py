@@ -3,13 +3,17 @@ Main Django Ninja API configuration.
 """
 
 import time
+from functools import cache
 
+import orjson
 from django.conf import settings
+from django.http import HttpResponse
 from ninja import NinjaAPI
 
 from .exceptions import APIExceptionHandler
-from .v1 import auth, brokers, events, marketdata, oms, strategies, system
+from .renderers import ORJSONParser, ORJSONRenderer
 from .v1.auth import AuthBearer
+from .v1.system import _readiness_checks
 
 # Main API instance
 api = NinjaAPI(
@@ -20,6 +24,8 @@ api = NinjaAPI(
     docs_url="/docs",
     openapi_url="/openapi.json",
     urls_namespace="api",
+    renderer=ORJSONRenderer(),
+    parser=ORJSONParser(),
 )
 
 # Add custom exception handler
@@ -31,50 +37,52 @@ api.add_exception_handler(Exception, APIExceptionHandler.handle_exception)
 
 # Include app-specific API routes
 
-# Register v1 API routes
-api.add_router("/v1/auth/", auth.router, tags=["Authentication"])
-api.add_router("/v1/brokers/", brokers.router, tags=["Broker Integration"])
-api.add_router("/v1/marketdata/", marketdata.router, tags=["Market Data"])
-api.add_router("/v1/oms/", oms.router, tags=["Order Management"])
-api.add_router("/v1/strategies/", strategies.router, tags=["Strategy Management"])
-api.add_router("/v1/events/", events.router, tags=["Events & Webhooks"])
-api.add_router("/v1/system/", system.router, tags=["System & Health"])
+# Register v1 API routes (resolved from dotted paths by Ninja)
+api.add_router("/v1/auth/", "apps.api.v1.auth.router", tags=["Authentication"])
+api.add_router(
+    "/v1/brokers/", "apps.api.v1.brokers.router", tags=["Broker Integration"]
+)
+api.add_router("/v1/marketdata/", "apps.api.v1.marketdata.router", tags=["Market Data"])
+api.add_router("/v1/oms/", "apps.api.v1.oms.router", tags=["Order Management"])
+api.add_router(
+    "/v1/strategies/", "apps.api.v1.strategies.router", tags=["Strategy Management"]
+)
+api.add_router("/v1/events/", "apps.api.v1.events.router", tags=["Events & Webhooks"])
+api.add_router("/v1/system/", "apps.api.v1.system.router", tags=["System & Health"])
+
+
+# Static payloads are serialised once and returned as raw JSON bytes
+_HEALTH_BODY = orjson.dumps({"status": "healthy", "service": "OMS Trading API"})
+_ROOT_BODY = orjson.dumps(
+    {
+        "service": "OMS Trading API",
+        "version": "1.0.0",
+        "documentation": "/docs",
+        "openapi": "/openapi.json",
+    }
+)
+
+
+def _json_bytes_response(body: bytes) -> HttpResponse:
+    return HttpResponse(body, content_type="application/json")
+
+
+def health_liveness(request):
+    """Liveness probe served ahead of Ninja routing (see urls.py)."""
+    return _json_bytes_response(_HEALTH_BODY)
 
 
 # Health check endpoint
 @api.get("/health", tags=["System"])
 def health_check(request):
     """Basic health check endpoint."""
-    return {"status": "healthy", "service": "OMS Trading API"}
+    return _json_bytes_response(_HEALTH_BODY)
 
 
 @api.get("/health/ready", tags=["System"])
 def health_ready(request):
     """Readiness probe endpoint for Kubernetes/load balancers."""
-    from django.core.cache import cache
-    from django.db import connection
-
-    checks = {"database": False, "cache": False, "overall": False}
-
-    # Check database connectivity
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT 1")
-            checks["database"] = True
-    except Exception:
-        checks["database"] = False
-
-    # Check cache connectivity
-    try:
-        cache.set("health_check", "ok", 10)
-        cache.get("health_check")
-        checks["cache"] = True
-    except Exception:
-        checks["cache"] = False
-
-    # Overall health
-    checks["overall"] = all([checks["database"], checks["cache"]])
-
+    checks = _readiness_checks()
     status = "ready" if checks["overall"] else "not_ready"
 
     return {
@@ -85,29 +93,31 @@ def health_ready(request):
     }
 
 
+@cache
+def _version_body() -> bytes:
+    import platform
+
+    return orjson.dumps(
+        {
+            "service": "OMS Trading API",
+            "version": "1.0.0",
+            "build_date": "2024-01-01T00:00:00Z",  # TODO: Get from build info
+            "git_commit": "unknown",  # TODO: Get from git
+            "python_version": platform.python_version(),
+            "django_version": "5.1.11",
+            "environment": getattr(settings, "DJANGO_SETTINGS_MODULE", "unknown"),
+        }
+    )
+
+
 @api.get("/version", tags=["System"])
 def version_info(request):
     """Get detailed version information."""
-    import platform
-
-    return {
-        "service": "OMS Trading API",
-        "version": "1.0.0",
-        "build_date": "2024-01-01T00:00:00Z",  # TODO: Get from build info
-        "git_commit": "unknown",  # TODO: Get from git
-        "python_version": platform.python_version(),
-        "django_version": "5.1.11",
-        "environment": getattr(settings, "DJANGO_SETTINGS_MODULE", "unknown"),
-    }
+    return _json_bytes_response(_version_body())
 
 
 # Root endpoint
 @api.get("/", tags=["System"])
 def root(request):
     """API root endpoint."""
-    return {
-        "service": "OMS Trading API",
-        "version": "1.0.0",
-        "documentation": "/docs",
-        "openapi": "/openapi.json",
-    }
+    return _json_bytes_response(_ROOT_BODY)
@@ -0,0 +1,45 @@
+"""
+orjson-based body parsing and response rendering for Django Ninja.
+"""
+
+from decimal import Decimal
+
+import orjson
+from django.http import HttpRequest
+from ninja.parser import Parser
+from ninja.renderers import BaseRenderer
+from ninja.responses import NinjaJSONEncoder
+
+# Types orjson does not handle natively (Pydantic models, lazy strings, ...)
+# fall back to Ninja's encoder so payloads keep their existing representation
+_fallback_default = NinjaJSONEncoder().default
+
+
+def orjson_default(obj):
+    # Decimal dominates OMS payloads (prices, quantities, P&L); serialise it
+    # as Ninja does (a string) without walking the encoder's isinstance chain
+    if type(obj) is Decimal:
+        return str(obj)
+    return _fallback_default(obj)
+
+
+class ORJSONRenderer(BaseRenderer):
+    """Render responses with orjson."""
+
+    media_type = "application/json"
+
+    def render(self, request: HttpRequest, data, *, response_status: int) -> bytes:
+        return orjson.dumps(
+            data,
+            default=orjson_default,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
+
+
+class ORJSONParser(Parser):
+    """Parse JSON request bodies with orjson."""
+
+    def parse_body(self, request: HttpRequest):
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError, so Ninja
+        # still turns malformed bodies into a 400
+        return orjson.loads(request.body)
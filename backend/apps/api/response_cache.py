@@ -0,0 +1,62 @@
+"""
+Short-lived caching of read endpoint results, invalidated on writes.
+"""
+
+import time
+from collections.abc import Callable
+from typing import Any
+
+import orjson
+from django.conf import settings
+from django.core.cache import cache
+
+from .renderers import orjson_default
+
+# Seconds a cached read is served when no write invalidates it first
+RESPONSE_CACHE_TTL = getattr(settings, "API_RESPONSE_CACHE_TTL", 30)
+
+
+def _generation_key(namespace: str) -> str:
+    return f"resp:{namespace}:gen"
+
+
+def cached_result(namespace: str, key: str, func: Callable[[], Any]) -> Any:
+    """Return `func()` for `namespace`/`key`, reusing a cached result.
+
+    Entries are stored with the namespace generation they were computed
+    under and both are read with one get_many, so a hit costs one round
+    trip. Bumping the generation (invalidate_namespace) retires every entry
+    in the namespace at once without scanning keys.
+
+    The result is normalised to plain JSON types first (UUIDs, datetimes and
+    Decimals become strings, as the renderer writes them), so the cache
+    serializer can store it and hits and misses return the same shapes.
+    """
+    generation_key = _generation_key(namespace)
+    cache_key = f"resp:{namespace}:{key}"
+    cached = cache.get_many([generation_key, cache_key])
+    generation = cached.get(generation_key)
+    entry = cached.get(cache_key)
+    if entry is not None and entry[0] == generation:
+        return entry[1]
+
+    result = orjson.loads(
+        orjson.dumps(
+            func(),
+            default=orjson_default,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
+    )
+    cache.set(cache_key, (generation, result), RESPONSE_CACHE_TTL)
+    return result
+
+
+def invalidate_namespace(namespace: str) -> None:
+    """Retire every cached result in `namespace`."""
+    generation_key = _generation_key(namespace)
+    try:
+        cache.incr(generation_key)
+    except ValueError:
+        # No generation yet (or it was evicted): start from a value no
+        # earlier entry can have been stored under
+        cache.set(generation_key, time.time_ns(), None)
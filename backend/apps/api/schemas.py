@@ -2,12 +2,16 @@
 Common API schemas for Django Ninja.
 """
 
-from datetime import datetime
+from datetime import UTC, datetime
+from functools import partial
 from typing import Annotated, Any
 
 from ninja import Schema
 from pydantic import Field
 
+# Aware UTC clock; datetime.utcnow is deprecated and returns naive values
+_utcnow = partial(datetime.now, UTC)
+
 
 class ErrorResponse(Schema):
     """Standard error response schema."""
@@ -36,8 +40,12 @@ class PaginationSchema(Schema):
 
     page: int = Field(description="Current page number")
     page_size: int = Field(description="Number of items per page")
-    total_count: int = Field(description="Total number of items")
-    total_pages: int = Field(description="Total number of pages")
+    total_count: int | None = Field(
+        description="Total number of items; null when with_count is false"
+    )
+    total_pages: int | None = Field(
+        description="Total number of pages; null when with_count is false"
+    )
     has_next: bool = Field(description="Whether there is a next page")
     has_previous: bool = Field(description="Whether there is a previous page")
 
@@ -103,7 +111,7 @@ class APIResponse(Schema):
     warnings: list[str] | None = Field(description="List of warnings")
     metadata: dict[str, Any] | None = Field(description="Additional metadata")
     timestamp: datetime = Field(
-        default_factory=datetime.utcnow, description="Response timestamp"
+        default_factory=_utcnow, description="Response timestamp"
     )
 
 
@@ -181,6 +189,16 @@ class BaseFilterSchema(Schema):
     page_size: int | None = Field(default=20, ge=1, le=100, description="Page size")
     search: str | None = Field(description="Search query")
     ordering: str | None = Field(description="Ordering field (prefix with - for desc)")
+    with_count: bool = Field(
+        default=True,
+        description="Include total_count/total_pages; false skips the COUNT",
+    )
+
+
+class CursorFilterSchema(BaseFilterSchema):
+    """Keyset pagination filter schema."""
+
+    cursor: str | None = Field(description="Cursor from the previous page")
 
 
 class DateRangeFilterSchema(BaseFilterSchema):
@@ -0,0 +1,30 @@
+"""
+Django signals for API app.
+"""
+
+from django.apps import apps as django_apps
+from django.db.models.signals import post_delete, post_save
+
+from .middleware import invalidate_tenant
+
+
+def tenant_changed_handler(sender, instance, **kwargs):
+    """Drop a saved or deleted tenant from the tenant caches.
+
+    TenantMiddleware may have cached it under its id and its subdomain.
+    """
+    invalidate_tenant(str(instance.pk))
+    subdomain = getattr(instance, "subdomain", None)
+    if subdomain:
+        invalidate_tenant(subdomain)
+
+
+try:
+    Tenant = django_apps.get_model("tenants", "Tenant")
+except LookupError:
+    # Tenancy is optional; without the app there is nothing to invalidate
+    Tenant = None
+
+if Tenant is not None:
+    post_save.connect(tenant_changed_handler, sender=Tenant)
+    post_delete.connect(tenant_changed_handler, sender=Tenant)
@@ -0,0 +1,62 @@
+"""
+Redis token buckets for throttling expensive endpoints.
+"""
+
+import math
+import time
+
+from django.core.cache import cache
+
+from apps.core.redis_client import get_default_redis
+
+# Refill, take one token if available and persist in one atomic round trip.
+# ARGV: capacity, refill rate (tokens/ms), now (ms). Returns {allowed, wait_ms}.
+BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed, wait = 0, 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    wait = math.ceil((1 - tokens) / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate))
+return {allowed, wait}
+"""
+
+_bucket_script = None
+
+
+def throttle(key: str, capacity: int, refill_per_sec: float) -> int:
+    """Take one token from the bucket at `key`.
+
+    Returns 0 when the call is allowed, otherwise the number of seconds to
+    wait before retrying (suitable for a Retry-After header).
+    """
+    global _bucket_script
+    client = get_default_redis()
+    if client is None:
+        # No Redis (LocMem): fixed window of one full refill
+        window = math.ceil(capacity / refill_per_sec)
+        cache.add(key, 0, window)
+        try:
+            count = cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, window)
+            count = 1
+        return 0 if count <= capacity else window
+
+    if _bucket_script is None:
+        _bucket_script = client.register_script(BUCKET_LUA)
+    allowed, wait_ms = _bucket_script(
+        keys=[key],
+        args=[capacity, refill_per_sec / 1000, time.time_ns() // 1_000_000],
+    )
+    return 0 if allowed else max(1, math.ceil(int(wait_ms) / 1000))
@@ -6,7 +6,7 @@ from django.contrib import admin
 from django.shortcuts import redirect
 from django.urls import include, path
 
-from .ninja_api import api
+from .ninja_api import api, health_liveness
 from .views.dashboard import (
     BacktestListView,
     BrokerManagementView,
@@ -39,6 +39,8 @@ dashboard_urls = (
 urlpatterns = [
     path("", lambda r: redirect("dashboard:index")),
     path("admin/", admin.site.urls),
+    # Liveness probes skip Ninja's auth and serialisation entirely
+    path("api/health", health_liveness, name="health_liveness"),
     path("api/", api.urls),
     path("dashboard/", include(dashboard_urls)),
 ]
@@ -2,50 +2,138 @@
 Authentication API endpoints.
 """
 
-from datetime import datetime
+import copy
+import hashlib
+import time
+import uuid
+from datetime import timedelta
 
 import jwt
 from django.conf import settings
 from django.contrib.auth import authenticate
-from django.db import transaction
-from django.http import HttpRequest
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.http import HttpRequest, HttpResponse
+from django.utils import timezone
 from ninja import Router
 from ninja.responses import codes_2xx, codes_4xx, codes_5xx
 from ninja.security import HttpBearer
 
+from apps.accounts.repositories import api_key_repository
 from apps.accounts.schemas import CreateApiKeyIn
+from apps.accounts.services import AuthService
+from apps.accounts.tokens import decode_hs256, encode_hs256
+from apps.core.audit import enqueue_audit_log
+from apps.core.localcache import TTLCache
 
 from ...accounts.models import ApiKey
-from ...core.models import AuditLog, User
+from ...core.models import User
 from ..schemas import ErrorResponse, SuccessResponse
+from ..throttling import throttle
 
 router = Router(tags=["Authentication"])
 
 
+def _lifetime_seconds(value: timedelta | int) -> int:
+    # Lifetimes are timedeltas in base settings and plain seconds in tests
+    if isinstance(value, timedelta):
+        return int(value.total_seconds())
+    return int(value)
+
+
+# Signing keys and token lifetimes are fixed for the life of the process
+_ACCESS_KEY = settings.JWT_SECRET_KEY.encode()
+_REFRESH_KEY = settings.JWT_REFRESH_TOKEN_SECRET_KEY.encode()
+_ACCESS_TTL = _lifetime_seconds(settings.JWT_ACCESS_TOKEN_LIFETIME)
+_REFRESH_TTL = _lifetime_seconds(settings.JWT_REFRESH_TOKEN_LIFETIME)
+
+# Claims a token must carry; a missing one fails decoding as invalid
+_REQUIRED_CLAIMS = ("exp", "user_id")
+
+# Token buckets guarding login and refresh: burst of 100, refilled at 100/min
+AUTH_THROTTLE_CAPACITY = 100
+AUTH_THROTTLE_REFILL = 100 / 60  # tokens per second
+
+# Verified tokens per process: sha256(token)[:16] -> (exp, iat, user).
+# Saves the JWT decode on repeat requests within the TTL.
+_verified_tokens = TTLCache(maxsize=10_000, ttl=30)
+
+# Cache key holding the unix second before which a user's tokens are rejected
+REVOKED_BEFORE_KEY = "auth:rev:{}"
+
+# User columns carried in the access token, in model field order as
+# from_db() expects; everything else is deferred and loads on access
+_TOKEN_USER_FIELDS = [
+    f.attname
+    for f in User._meta.concrete_fields
+    if f.attname in {"id", "email", "first_name", "last_name", "is_active"}
+]
+
+
+def revoke_user_tokens(user_id) -> None:
+    """Reject every token issued to a user up to now, across all workers."""
+    # Outlives any refresh token issued before the revocation
+    cache.set(REVOKED_BEFORE_KEY.format(user_id), int(time.time()), _REFRESH_TTL)
+
+
+def _is_revoked(user_id: str, issued_at: int) -> bool:
+    # Strictly earlier: iat has whole-second resolution, so a login in the
+    # same second as the logout must not be rejected for the watermark's
+    # lifetime. Tokens issued earlier in that same second survive instead.
+    revoked_before = cache.get(REVOKED_BEFORE_KEY.format(user_id))
+    return revoked_before is not None and issued_at < revoked_before
+
+
+def _user_from_claims(payload: dict) -> User:
+    """Build the request user from access-token claims without a query."""
+    claims = {
+        "id": uuid.UUID(payload["user_id"]),
+        "email": payload.get("email", ""),
+        "first_name": payload.get("first_name", ""),
+        "last_name": payload.get("last_name", ""),
+        "is_active": payload.get("is_active", True),
+    }
+    return User.from_db(
+        "default", _TOKEN_USER_FIELDS, [claims[f] for f in _TOKEN_USER_FIELDS]
+    )
+
+
 class AuthBearer(HttpBearer):
-    """JWT Bearer token authentication for protected endpoints."""
+    """JWT Bearer token authentication for protected endpoints.
+
+    Access tokens are short-lived and carry the user's identity, so they are
+    validated offline; logout is enforced through a shared revocation mark.
+    """
 
     def authenticate(self, request: HttpRequest, token: str) -> User | None:
         """Authenticate JWT token."""
+        cache_key = hashlib.sha256(token.encode()).digest()[:16]
+        cached = _verified_tokens.get(cache_key)
+        if cached is not None:
+            exp, iat, user = cached
+            if exp < time.time() or _is_revoked(str(user.id), iat):
+                _verified_tokens.pop(cache_key)
+                return None
+            # Hand each request its own instance; the cached one is shared
+            user = copy.copy(user)
+            request.user = user
+            return user
+
         try:
             # Decode JWT token
-            payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=["HS256"])
-
-            # Check if token is expired
-            if datetime.fromtimestamp(payload["exp"]) < datetime.utcnow():
+            payload = decode_hs256(token, _ACCESS_KEY, require=_REQUIRED_CLAIMS)
+            if not payload.get("is_active", True):
                 return None
 
-            # Get user
-            user_id = payload.get("user_id")
-            if not user_id:
+            iat = payload.get("iat", 0)
+            if _is_revoked(payload["user_id"], iat):
                 return None
 
-            try:
-                user = User.objects.get(id=user_id, is_active=True)
-                request.user = user
-                return user
-            except User.DoesNotExist:
-                return None
+            user = _user_from_claims(payload)
+
+            _verified_tokens.set(cache_key, (payload["exp"], iat, copy.copy(user)))
+            request.user = user
+            return user
 
         except jwt.InvalidTokenError:
             return None
@@ -61,9 +149,27 @@ class AuthBearer(HttpBearer):
         codes_5xx: ErrorResponse,
     },
 )
-def login_user(request, email: str, password: str):
+def login_user(request, email: str, password: str, response: HttpResponse):
     """User login endpoint with JWT token generation."""
+    # Throttle before authenticate() so brute force never reaches the hasher
+    throttled = _throttle(
+        response,
+        f"rl:lg:{email.lower()}",
+        f"rl:lg:ip:{_get_client_ip(request)}",
+    )
+    if throttled:
+        return throttled
+
+    user = None
     try:
+        # Check the lock first: a locked account must not cost a password hash
+        if User.objects.filter(email=email, locked_until__gt=timezone.now()).exists():
+            return {
+                "success": False,
+                "message": "Account locked",
+                "error": "Account is temporarily locked due to failed login attempts",
+            }, 423
+
         # Authenticate user
         user = authenticate(username=email, password=password)
         if not user or not user.is_active:
@@ -73,23 +179,17 @@ def login_user(request, email: str, password: str):
                 "error": "Invalid email or password",
             }, 401
 
-        # Check if user is locked
-        if user.is_locked():
-            return {
-                "success": False,
-                "message": "Account locked",
-                "error": "Account is temporarily locked due to failed login attempts",
-            }, 423
-
         # Reset failed login attempts
         user.reset_failed_login()
 
         # Generate JWT tokens
-        access_token = _generate_access_token(user)
-        refresh_token = _generate_refresh_token(user)
+        # Both tokens share one issue time
+        now = int(time.time())
+        access_token = _generate_access_token(user, now)
+        refresh_token = _generate_refresh_token(user, now)
 
         # Log successful login
-        AuditLog.objects.create(
+        enqueue_audit_log(
             user=user,
             action="LOGIN",
             resource_type="USER",
@@ -104,7 +204,7 @@ def login_user(request, email: str, password: str):
             "data": {
                 "access_token": access_token,
                 "refresh_token": refresh_token,
-                "expires_in": settings.JWT_ACCESS_TOKEN_LIFETIME.total_seconds(),
+                "expires_in": _ACCESS_TTL,
                 "user": {
                     "id": str(user.id),
                     "email": user.email,
@@ -124,33 +224,29 @@ def login_user(request, email: str, password: str):
 
 
 @router.post("/refresh")
-def refresh_token(request, refresh_token: str):
+def refresh_token(request, refresh_token: str, response: HttpResponse):
     """Refresh JWT access token."""
     try:
-        # Decode refresh token
-        payload = jwt.decode(
-            refresh_token, settings.JWT_REFRESH_TOKEN_SECRET_KEY, algorithms=["HS256"]
-        )
+        # Decode refresh token; expired tokens raise ExpiredSignatureError
+        payload = decode_hs256(refresh_token, _REFRESH_KEY, require=_REQUIRED_CLAIMS)
+        user_id = payload["user_id"]
 
-        # Check if token is expired
-        if datetime.fromtimestamp(payload["exp"]) < datetime.utcnow():
-            return {
-                "success": False,
-                "message": "Token expired",
-                "error": "Refresh token has expired",
-            }, 401
+        throttled = _throttle(response, f"rl:rt:{user_id}")
+        if throttled:
+            return throttled
 
-        # Get user
-        user_id = payload.get("user_id")
-        if not user_id:
+        if _is_revoked(user_id, payload.get("iat", 0)):
             return {
                 "success": False,
                 "message": "Invalid token",
-                "error": "Invalid refresh token",
+                "error": "Refresh token has been revoked",
             }, 401
 
         try:
-            user = User.objects.get(id=user_id, is_active=True)
+            # Only the columns the access token embeds
+            user = User.objects.only(*_TOKEN_USER_FIELDS).get(
+                id=user_id, is_active=True
+            )
         except User.DoesNotExist:
             return {
                 "success": False,
@@ -166,10 +262,16 @@ def refresh_token(request, refresh_token: str):
             "message": "Token refreshed",
             "data": {
                 "access_token": new_access_token,
-                "expires_in": settings.JWT_ACCESS_TOKEN_LIFETIME.total_seconds(),
+                "expires_in": _ACCESS_TTL,
             },
         }
 
+    except jwt.ExpiredSignatureError:
+        return {
+            "success": False,
+            "message": "Token expired",
+            "error": "Refresh token has expired",
+        }, 401
     except jwt.InvalidTokenError:
         return {
             "success": False,
@@ -197,8 +299,10 @@ def logout_user(request):
                 "error": "User not authenticated",
             }, 401
 
+        revoke_user_tokens(user.id)
+
         # Log logout
-        AuditLog.objects.create(
+        enqueue_audit_log(
             user=user,
             action="LOGOUT",
             resource_type="USER",
@@ -225,26 +329,25 @@ def get_current_user(request):
                 "error": "User not authenticated",
             }, 401
 
+        # request.user only carries the token claims; load the full row
+        user = User.objects.get(pk=user.pk)
+
         return {
             "success": True,
             "data": {
                 "user": {
-                    "id": str(user.id),
+                    "id": user.id,
                     "email": user.email,
                     "first_name": user.first_name,
                     "last_name": user.last_name,
                     "phone_number": user.phone_number,
-                    "date_of_birth": (
-                        user.date_of_birth.isoformat() if user.date_of_birth else None
-                    ),
+                    "date_of_birth": user.date_of_birth,
                     "timezone": user.timezone,
                     "language": user.language,
                     "two_factor_enabled": user.two_factor_enabled,
                     "email_verified": user.email_verified,
-                    "last_login": (
-                        user.last_login.isoformat() if user.last_login else None
-                    ),
-                    "created_at": user.created_at.isoformat(),
+                    "last_login": user.last_login,
+                    "created_at": user.created_at,
                 },
             },
         }
@@ -268,14 +371,6 @@ def register_user(
 ):
     """User registration endpoint."""
     try:
-        # Check if user already exists
-        if User.objects.filter(email=email).exists():
-            return {
-                "success": False,
-                "message": "Registration failed",
-                "error": "User with this email already exists",
-            }, 409
-
         # Validate password strength
         if len(password) < 8:
             return {
@@ -284,26 +379,39 @@ def register_user(
                 "error": "Password must be at least 8 characters long",
             }, 400
 
-        # Create user
-        with transaction.atomic():
-            user = User.objects.create_user(
-                email=email,
-                password=password,
-                first_name=first_name,
-                last_name=last_name,
-                phone_number=phone_number,
-                email_verified=False,  # Require email verification
-            )
+        user = User(
+            email=User.objects.normalize_email(email),
+            first_name=first_name,
+            last_name=last_name,
+            phone_number=phone_number,
+            email_verified=False,  # Require email verification
+        )
+        # Hash before opening the transaction so the CPU-bound hasher does
+        # not hold a database connection
+        user.set_password(password)
 
-            # Log registration
-            AuditLog.objects.create(
-                user=user,
-                action="CREATE",
-                resource_type="USER",
-                resource_id=str(user.id),
-                ip_address=_get_client_ip(request),
-                user_agent=request.META.get("HTTP_USER_AGENT", ""),
-            )
+        # Create user; the unique constraint on email rejects duplicates, so
+        # there is no separate existence check
+        try:
+            with transaction.atomic():
+                user.save()
+
+                # Log registration once the user row is committed
+                audit_fields = {
+                    "user": user,
+                    "action": "CREATE",
+                    "resource_type": "USER",
+                    "resource_id": str(user.id),
+                    "ip_address": _get_client_ip(request),
+                    "user_agent": request.META.get("HTTP_USER_AGENT", ""),
+                }
+                transaction.on_commit(lambda: enqueue_audit_log(**audit_fields))
+        except IntegrityError:
+            return {
+                "success": False,
+                "message": "Registration failed",
+                "error": "User with this email already exists",
+            }, 409
 
         return {
             "success": True,
@@ -340,7 +448,7 @@ def create_api_key(request, payload: CreateApiKeyIn):
         expires_at=payload.expires_at,
     )
 
-    AuditLog.objects.create(
+    enqueue_audit_log(
         user=user,
         action="CREATE",
         resource_type="API_KEY",
@@ -354,15 +462,13 @@ def create_api_key(request, payload: CreateApiKeyIn):
         "success": True,
         "message": "API key created successfully",
         "data": {
-            "api_key_id": str(api_key.id),
+            "api_key_id": api_key.id,
             "name": api_key.name,
             "key_prefix": api_key.key_prefix,
             "full_key": api_key.get_full_key(),
             "scopes": api_key.scopes,
-            "expires_at": (
-                api_key.expires_at.isoformat() if api_key.expires_at else None
-            ),
-            "created_at": api_key.created_at.isoformat(),
+            "expires_at": api_key.expires_at,
+            "created_at": api_key.created_at,
         },
     }
 
@@ -380,27 +486,15 @@ def list_api_keys(request):
             }, 401
 
         # Get user's API keys
-        api_keys = ApiKey.objects.filter().order_by("-created_at")
+        api_keys = api_key_repository.list_for_user(
+            getattr(request, "tenant_id", None), user
+        )
 
         return {
             "success": True,
             "data": {
-                "api_keys": [
-                    {
-                        "id": str(key.id),
-                        "name": key.name,
-                        "key_prefix": key.key_prefix,
-                        "scopes": key.scopes,
-                        "expires_at": (
-                            key.expires_at.isoformat() if key.expires_at else None
-                        ),
-                        "created_at": key.created_at.isoformat(),
-                        "last_used_at": (
-                            key.last_used_at.isoformat() if key.last_used_at else None
-                        ),
-                    }
-                    for key in api_keys
-                ]
+                # UUIDs and datetimes are serialized by the orjson renderer
+                "api_keys": list(api_keys)
             },
         }
 
@@ -424,29 +518,33 @@ def delete_api_key(request, api_key_id: str):
                 "error": "User not authenticated",
             }, 401
 
-        # Get and delete API key
-        try:
-            api_key = ApiKey.objects.get(id=api_key_id, user=user, is_active=True)
-        except ApiKey.DoesNotExist:
+        # Name is only needed for the audit entry
+        api_key = (
+            ApiKey.objects.filter(id=api_key_id, user=user, is_active=True)
+            .values("id", "name")
+            .first()
+        )
+        # Soft delete with a narrow UPDATE; 0 rows means it was already gone
+        if api_key is None or not api_key_repository.soft_delete(
+            api_key_id, getattr(request, "tenant_id", None), user
+        ):
             return {
                 "success": False,
                 "message": "API key not found",
                 "error": "API key does not exist or access denied",
             }, 404
 
-        # Soft delete
-        api_key.is_active = False
-        api_key.save()
+        AuthService.invalidate_api_key_cache(api_key["id"])
 
         # Log deletion
-        AuditLog.objects.create(
+        enqueue_audit_log(
             user=user,
             action="DELETE",
             resource_type="API_KEY",
-            resource_id=str(api_key.id),
+            resource_id=str(api_key["id"]),
             ip_address=_get_client_ip(request),
             user_agent=request.META.get("HTTP_USER_AGENT", ""),
-            metadata={"key_name": api_key.name},
+            metadata={"key_name": api_key["name"]},
         )
 
         return {"success": True, "message": "API key deleted successfully"}
@@ -462,34 +560,55 @@ def delete_api_key(request, api_key_id: str):
 # Helper functions
 
 
-def _generate_access_token(user: User) -> str:
-    """Generate JWT access token."""
+def _generate_access_token(user: User, now: int | None = None) -> str:
+    """Generate JWT access token issued at `now` (unix seconds, default: now)."""
+    if now is None:
+        now = int(time.time())
     payload = {
         "user_id": str(user.id),
         "email": user.email,
-        "exp": datetime.utcnow() + settings.JWT_ACCESS_TOKEN_LIFETIME,
-        "iat": datetime.utcnow(),
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "is_active": user.is_active,
+        "exp": now + _ACCESS_TTL,
+        "iat": now,
         "type": "access",
     }
-    return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm="HS256")
+    return encode_hs256(payload, _ACCESS_KEY)
 
 
-def _generate_refresh_token(user: User) -> str:
-    """Generate JWT refresh token."""
+def _generate_refresh_token(user: User, now: int | None = None) -> str:
+    """Generate JWT refresh token issued at `now` (unix seconds, default: now)."""
+    if now is None:
+        now = int(time.time())
     payload = {
         "user_id": str(user.id),
-        "exp": datetime.utcnow() + settings.JWT_REFRESH_TOKEN_LIFETIME,
-        "iat": datetime.utcnow(),
+        "exp": now + _REFRESH_TTL,
+        "iat": now,
         "type": "refresh",
     }
-    return jwt.encode(payload, settings.JWT_REFRESH_TOKEN_SECRET_KEY, algorithm="HS256")
+    return encode_hs256(payload, _REFRESH_KEY)
+
+
+def _throttle(response: HttpResponse, *keys: str) -> tuple | None:
+    """Return a 429 response if any of the token buckets is empty."""
+    for key in keys:
+        retry_after = throttle(key, AUTH_THROTTLE_CAPACITY, AUTH_THROTTLE_REFILL)
+        if retry_after:
+            response["Retry-After"] = str(retry_after)
+            return {
+                "success": False,
+                "message": "Too many requests",
+                "error": "rate_limited",
+            }, 429
+    return None
 
 
 def _get_client_ip(request: HttpRequest) -> str:
     """Get client IP address from request."""
     x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
     if x_forwarded_for:
-        ip = x_forwarded_for.split(",")[0].strip()
-    else:
-        ip = request.META.get("REMOTE_ADDR", "unknown")
-    return ip
+        # First hop only; no list allocation for multi-proxy chains
+        idx = x_forwarded_for.find(",")
+        return (x_forwarded_for[:idx] if idx != -1 else x_forwarded_for).strip()
+    return request.META.get("REMOTE_ADDR", "unknown")
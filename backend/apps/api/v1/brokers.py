@@ -15,25 +15,40 @@ from ...brokers.schemas import (
     BrokerResponseSchema,
     BrokerUpdateSchema,
 )
-from ..base import BaseService, DjangoRepository
+from ..base import BaseService, DjangoRepository, api_controller, require_tenant
 from ..exceptions import NotFoundAPIError, PermissionAPIError
+from ..response_cache import cached_result, invalidate_namespace
 from ..schemas import (
     BaseFilterSchema,
     PaginatedResponse,
+    PaginationSchema,
 )
 
 router = Router(tags=["Broker Integration"])
 
+# Cached broker list/detail reads; retired on every broker write
+BROKER_CACHE_NAMESPACE = "brokers"
+
 
 class BrokerRepository(DjangoRepository[Broker]):
     """Repository for broker operations."""
 
+    # Columns exposed by BrokerResponseSchema
+    SERIALIZATION_FIELDS = [
+        "id",
+        "name",
+        "broker_type",
+        "description",
+        "is_active",
+        "created_at",
+        "updated_at",
+    ]
+
     def get_by_id(self, id: str, tenant_id: str | None = None) -> Broker:
         """Get broker by ID with tenant filtering."""
         try:
-            queryset = self.model.objects.filter(id=id)
-            if tenant_id:
-                queryset = queryset.filter(tenant_id=tenant_id)
+            queryset = self.get_queryset().filter(id=id)
+            queryset = self.scope_to_tenant(queryset, tenant_id)
             return queryset.get()
         except Broker.DoesNotExist:
             raise NotFoundAPIError(f"Broker with id {id} not found")
@@ -45,9 +60,8 @@ class BrokerAccountRepository(DjangoRepository[BrokerAccount]):
     def get_by_id(self, id: str, tenant_id: str | None = None) -> BrokerAccount:
         """Get broker account by ID with tenant filtering."""
         try:
-            queryset = self.model.objects.filter(id=id)
-            if tenant_id:
-                queryset = queryset.filter(tenant_id=tenant_id)
+            queryset = self.get_queryset().filter(id=id)
+            queryset = self.scope_to_tenant(queryset, tenant_id)
             return queryset.get()
         except BrokerAccount.DoesNotExist:
             raise NotFoundAPIError(f"Broker account with id {id} not found")
@@ -57,7 +71,12 @@ class BrokerService(BaseService):
     """Service for broker business logic."""
 
     def __init__(self):
-        super().__init__(BrokerRepository(Broker))
+        # Reads only load the columns the API returns; updates save just the
+        # changed fields and deletes go through a queryset, so neither needs
+        # the full row
+        super().__init__(
+            BrokerRepository(Broker, only=BrokerRepository.SERIALIZATION_FIELDS)
+        )
 
     def create_broker(
         self, data: dict[str, Any], tenant_id: str, user_id: str
@@ -67,19 +86,18 @@ class BrokerService(BaseService):
         if not self.validate_permissions(user_id, "create", "broker"):
             raise PermissionAPIError("Insufficient permissions to create broker")
 
-        # Add tenant_id to data
-        data["tenant_id"] = tenant_id
-
         # Create broker
         broker = self.repository.create(data, tenant_id)
+        invalidate_namespace(BROKER_CACHE_NAMESPACE)
 
         # Log audit trail
-        self.audit_log(
-            action="create",
-            resource_type="broker",
-            resource_id=str(broker.id),
-            user_id=user_id,
-        )
+        if self.audit_enabled("broker"):
+            self.audit_log(
+                action="create",
+                resource_type="broker",
+                resource_id=str(broker.id),
+                user_id=user_id,
+            )
 
         return broker
 
@@ -93,14 +111,16 @@ class BrokerService(BaseService):
 
         # Update broker
         broker = self.repository.update(broker_id, data, tenant_id)
+        invalidate_namespace(BROKER_CACHE_NAMESPACE)
 
         # Log audit trail
-        self.audit_log(
-            action="update",
-            resource_type="broker",
-            resource_id=broker_id,
-            user_id=user_id,
-        )
+        if self.audit_enabled("broker"):
+            self.audit_log(
+                action="update",
+                resource_type="broker",
+                resource_id=broker_id,
+                user_id=user_id,
+            )
 
         return broker
 
@@ -112,14 +132,16 @@ class BrokerService(BaseService):
 
         # Delete broker
         result = self.repository.delete(broker_id, tenant_id)
+        invalidate_namespace(BROKER_CACHE_NAMESPACE)
 
         # Log audit trail
-        self.audit_log(
-            action="delete",
-            resource_type="broker",
-            resource_id=broker_id,
-            user_id=user_id,
-        )
+        if self.audit_enabled("broker"):
+            self.audit_log(
+                action="delete",
+                resource_type="broker",
+                resource_id=broker_id,
+                user_id=user_id,
+            )
 
         return result
 
@@ -128,7 +150,12 @@ class BrokerAccountService(BaseService):
     """Service for broker account business logic."""
 
     def __init__(self):
-        super().__init__(BrokerAccountRepository(BrokerAccount))
+        # Accounts are read with their connection and broker (can_trade etc.)
+        super().__init__(
+            BrokerAccountRepository(
+                BrokerAccount, select_related=["broker_connection__broker"]
+            )
+        )
 
     def create_broker_account(
         self, data: dict[str, Any], tenant_id: str, user_id: str
@@ -140,19 +167,17 @@ class BrokerAccountService(BaseService):
                 "Insufficient permissions to create broker account"
             )
 
-        # Add tenant_id to data
-        data["tenant_id"] = tenant_id
-
         # Create broker account
         account = self.repository.create(data, tenant_id)
 
         # Log audit trail
-        self.audit_log(
-            action="create",
-            resource_type="broker_account",
-            resource_id=str(account.id),
-            user_id=user_id,
-        )
+        if self.audit_enabled("broker_account"):
+            self.audit_log(
+                action="create",
+                resource_type="broker_account",
+                resource_id=str(account.id),
+                user_id=user_id,
+            )
 
         return account
 
@@ -162,280 +187,193 @@ broker_service = BrokerService()
 broker_account_service = BrokerAccountService()
 
 
+def _user_id(request: HttpRequest) -> str | None:
+    return str(request.user.id) if request.user.is_authenticated else None
+
+
+def _broker_to_schema(row: dict[str, Any], tenant_id: str) -> BrokerResponseSchema:
+    """Build the broker response from a freshly saved broker's fields.
+
+    The values come straight from the model and already match the schema, so
+    the instance is built with model_construct and Ninja passes it through
+    without validating again. Cached rows hold JSON strings instead (see
+    get_broker) and must not come through here.
+    """
+    return BrokerResponseSchema.model_construct(
+        **{**row, "id": str(row["id"]), "tenant_id": tenant_id}
+    )
+
+
+def _broker_row(broker: Broker) -> dict[str, Any]:
+    return {
+        field: getattr(broker, field) for field in BrokerRepository.SERIALIZATION_FIELDS
+    }
+
+
 @router.get("/", response=PaginatedResponse)
+@api_controller
 def list_brokers(request: HttpRequest, filters: Query[BaseFilterSchema] = Query(...)):
     """List all brokers for the current tenant."""
-    try:
-        tenant_id = getattr(request, "tenant_id", None)
-        if not tenant_id:
-            return {
-                "success": False,
-                "message": "Tenant context required",
-                "error": "No tenant ID found in request",
-            }, 400
-
-        result = broker_service.repository.list(
+    tenant_id = require_tenant(request)
+
+    # Rows come back as JSON-ready dicts (see cached_result)
+    result = cached_result(
+        BROKER_CACHE_NAMESPACE,
+        f"list:{tenant_id}:{sorted(filters.dict().items())}",
+        lambda: broker_service.repository.list(
             page=filters.page,
             page_size=filters.page_size,
             ordering=filters.ordering,
-        )
+            fields=BrokerRepository.SERIALIZATION_FIELDS,
+            as_values=True,
+            with_count=filters.with_count,
+        ),
+    )
 
-        return {
-            "pagination": result["pagination"],
-            "data": [
-                BrokerResponseSchema.from_orm(broker) for broker in result["data"]
-            ],
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "message": "Failed to list brokers",
-            "error": str(e),
-        }, 500
+    # Rows and page metadata come straight from the database, so the page is
+    # assembled without re-validating (and copying) every row dict
+    return PaginatedResponse.model_construct(
+        pagination=PaginationSchema.model_construct(**result["pagination"]),
+        data=result["data"],
+    )
 
 
 @router.get("/{broker_id}", response=BrokerResponseSchema)
+@api_controller
 def get_broker(request: HttpRequest, broker_id: str):
     """Get broker by ID."""
-    try:
-        tenant_id = getattr(request, "tenant_id", None)
-        if not tenant_id:
-            return {
-                "success": False,
-                "message": "Tenant context required",
-                "error": "No tenant ID found in request",
-            }, 400
-
-        broker = broker_service.repository.get_by_id(broker_id, tenant_id)
-        return BrokerResponseSchema.from_orm(broker)
-    except Exception as e:
-        return {
-            "success": False,
-            "message": "Failed to get broker",
-            "error": str(e),
-        }, 500
+    tenant_id = require_tenant(request)
+    # A plain row is read without building a model; cached_result hands it
+    # back JSON-normalised (ISO datetimes), so it is validated into the schema
+    row = cached_result(
+        BROKER_CACHE_NAMESPACE,
+        f"detail:{tenant_id}:{broker_id}",
+        lambda: broker_service.repository.get_values_by_id(
+            broker_id, BrokerRepository.SERIALIZATION_FIELDS, tenant_id
+        ),
+    )
+    return BrokerResponseSchema.model_validate({**row, "tenant_id": tenant_id})
 
 
 @router.post("/", response=BrokerResponseSchema)
+@api_controller
 def create_broker(request: HttpRequest, data: BrokerCreateSchema):
     """Create a new broker."""
-    try:
-        tenant_id = getattr(request, "tenant_id", None)
-        if not tenant_id:
-            return {
-                "success": False,
-                "message": "Tenant context required",
-                "error": "No tenant ID found in request",
-            }, 400
-
-        broker = broker_service.create_broker(
-            data.dict(),
-            user_id=str(request.user.id) if request.user.is_authenticated else None,
-        )
-        return BrokerResponseSchema.from_orm(broker)
-    except Exception as e:
-        return {
-            "success": False,
-            "message": "Failed to create broker",
-            "error": str(e),
-        }, 500
+    tenant_id = require_tenant(request)
+    broker = broker_service.create_broker(
+        data.dict(), tenant_id=tenant_id, user_id=_user_id(request)
+    )
+    return _broker_to_schema(_broker_row(broker), tenant_id)
 
 
 @router.put("/{broker_id}", response=BrokerResponseSchema)
+@api_controller
 def update_broker(request: HttpRequest, broker_id: str, data: BrokerUpdateSchema):
     """Update existing broker."""
-    try:
-        tenant_id = getattr(request, "tenant_id", None)
-        if not tenant_id:
-            return {
-                "success": False,
-                "message": "Tenant context required",
-                "error": "No tenant ID found in request",
-            }, 400
-
-        broker = broker_service.update_broker(
-            broker_id,
-            data.dict(exclude_unset=True),
-            user_id=str(request.user.id) if request.user.is_authenticated else None,
-        )
-        return BrokerResponseSchema.from_orm(broker)
-    except Exception as e:
-        return {
-            "success": False,
-            "message": "Failed to update broker",
-            "error": str(e),
-        }, 500
+    tenant_id = require_tenant(request)
+    broker = broker_service.update_broker(
+        broker_id,
+        data.dict(exclude_unset=True),
+        tenant_id=tenant_id,
+        user_id=_user_id(request),
+    )
+    return _broker_to_schema(_broker_row(broker), tenant_id)
 
 
 @router.delete("/{broker_id}")
+@api_controller
 def delete_broker(request: HttpRequest, broker_id: str):
     """Delete broker."""
-    try:
-        tenant_id = getattr(request, "tenant_id", None)
-        if not tenant_id:
-            return {
-                "success": False,
-                "message": "Tenant context required",
-                "error": "No tenant ID found in request",
-            }, 400
-
-        broker_service.delete_broker(
-            broker_id,
-            user_id=str(request.user.id) if request.user.is_authenticated else None,
-        )
-        return {"success": True, "message": "Broker deleted successfully"}
-    except Exception as e:
-        return {
-            "success": False,
-            "message": "Failed to delete broker",
-            "error": str(e),
-        }, 500
+    tenant_id = require_tenant(request)
+    broker_service.delete_broker(
+        broker_id, tenant_id=tenant_id, user_id=_user_id(request)
+    )
+    return {"success": True, "message": "Broker deleted successfully"}
 
 
 # Broker Accounts endpoints
 @router.get("/{broker_id}/accounts", response=PaginatedResponse)
+@api_controller
 def list_broker_accounts(
     request: HttpRequest, broker_id: str, filters: Query[BaseFilterSchema] = Query(...)
 ):
     """List accounts for a specific broker."""
-    try:
-        tenant_id = getattr(request, "tenant_id", None)
-        if not tenant_id:
-            return {
-                "success": False,
-                "message": "Tenant context required",
-                "error": "No tenant ID found in request",
-            }, 400
-
-        # TODO: Implement broker account listing
-        return {
-            "pagination": {
-                "page": 1,
-                "page_size": 20,
-                "total_count": 0,
-                "total_pages": 0,
-                "has_next": False,
-                "has_previous": False,
-            },
-            "data": [],
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "message": "Failed to list broker accounts",
-            "error": str(e),
-        }, 500
+    require_tenant(request)
+
+    # TODO: Implement broker account listing
+    return {
+        "pagination": {
+            "page": 1,
+            "page_size": 20,
+            "total_count": 0,
+            "total_pages": 0,
+            "has_next": False,
+            "has_previous": False,
+        },
+        "data": [],
+    }
 
 
 @router.post("/{broker_id}/accounts", response=BrokerAccountResponseSchema)
+@api_controller
 def create_broker_account(
     request: HttpRequest, broker_id: str, data: BrokerAccountCreateSchema
 ):
     """Create a new broker account."""
-    try:
-        tenant_id = getattr(request, "tenant_id", None)
-        if not tenant_id:
-            return {
-                "success": False,
-                "message": "Tenant context required",
-                "error": "No tenant ID found in request",
-            }, 400
-
-        # Add broker_id to data
-        account_data = data.dict()
-        account_data["broker_id"] = broker_id
-
-        account = broker_account_service.create_broker_account(
-            account_data,
-            user_id=str(request.user.id) if request.user.is_authenticated else None,
-        )
-        return BrokerAccountResponseSchema.from_orm(account)
-    except Exception as e:
-        return {
-            "success": False,
-            "message": "Failed to create broker account",
-            "error": str(e),
-        }, 500
+    tenant_id = require_tenant(request)
+
+    # Add broker_id to data
+    account_data = data.dict()
+    account_data["broker_id"] = broker_id
+
+    account = broker_account_service.create_broker_account(
+        account_data, tenant_id=tenant_id, user_id=_user_id(request)
+    )
+    return account
 
 
 # Broker connection endpoints
 @router.post("/{broker_id}/connect")
+@api_controller
 def connect_broker(request: HttpRequest, broker_id: str):
     """Connect to broker."""
-    try:
-        tenant_id = getattr(request, "tenant_id", None)
-        if not tenant_id:
-            return {
-                "success": False,
-                "message": "Tenant context required",
-                "error": "No tenant ID found in request",
-            }, 400
-
-        # TODO: Implement broker connection logic
-        return {
-            "success": True,
-            "message": "Broker connection initiated",
-            "data": {"broker_id": broker_id, "status": "connecting"},
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "message": "Failed to connect to broker",
-            "error": str(e),
-        }, 500
+    require_tenant(request)
+
+    # TODO: Implement broker connection logic
+    return {
+        "success": True,
+        "message": "Broker connection initiated",
+        "data": {"broker_id": broker_id, "status": "connecting"},
+    }
 
 
 @router.post("/{broker_id}/disconnect")
+@api_controller
 def disconnect_broker(request: HttpRequest, broker_id: str):
     """Disconnect from broker."""
-    try:
-        tenant_id = getattr(request, "tenant_id", None)
-        if not tenant_id:
-            return {
-                "success": False,
-                "message": "Tenant context required",
-                "error": "No tenant ID found in request",
-            }, 400
-
-        # TODO: Implement broker disconnection logic
-        return {
-            "success": True,
-            "message": "Broker disconnection initiated",
-            "data": {"broker_id": broker_id, "status": "disconnecting"},
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "message": "Failed to disconnect from broker",
-            "error": str(e),
-        }, 500
+    require_tenant(request)
+
+    # TODO: Implement broker disconnection logic
+    return {
+        "success": True,
+        "message": "Broker disconnection initiated",
+        "data": {"broker_id": broker_id, "status": "disconnecting"},
+    }
 
 
 @router.get("/{broker_id}/status")
+@api_controller
 def get_broker_status(request: HttpRequest, broker_id: str):
     """Get broker connection status."""
-    try:
-        tenant_id = getattr(request, "tenant_id", None)
-        if not tenant_id:
-            return {
-                "success": False,
-                "message": "Tenant context required",
-                "error": "No tenant ID found in request",
-            }, 400
-
-        # TODO: Implement broker status checking
-        return {
-            "success": True,
-            "data": {
-                "broker_id": broker_id,
-                "status": "disconnected",
-                "last_connection": None,
-                "connection_health": "unknown",
-            },
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "message": "Failed to get broker status",
-            "error": str(e),
-        }, 500
+    require_tenant(request)
+
+    # TODO: Implement broker status checking
+    return {
+        "success": True,
+        "data": {
+            "broker_id": broker_id,
+            "status": "disconnected",
+            "last_connection": None,
+            "connection_health": "unknown",
+        },
+    }
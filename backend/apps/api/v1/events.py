@@ -4,16 +4,17 @@ Events and webhooks API endpoints.
 
 from typing import Any
 
-from django.http import HttpRequest
+import orjson
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import patch_cache_control
 from ninja import Router
 
 router = Router()
 
 
-@router.get("/", tags=["Events"])
-def list_events(request: HttpRequest) -> dict[str, Any]:
-    """List available events."""
-    return {
+# The event catalogue is static, so its body is serialized once
+_EVENTS_BODY = orjson.dumps(
+    {
         "events": [
             "order.created",
             "order.filled",
@@ -23,6 +24,18 @@ def list_events(request: HttpRequest) -> dict[str, Any]:
             "broker.disconnected",
         ]
     }
+)
+
+# Seconds clients and proxies may reuse the event catalogue
+EVENTS_MAX_AGE = 60
+
+
+@router.get("/", tags=["Events"])
+def list_events(request: HttpRequest) -> HttpResponse:
+    """List available events."""
+    response = HttpResponse(_EVENTS_BODY, content_type="application/json")
+    patch_cache_control(response, public=True, max_age=EVENTS_MAX_AGE)
+    return response
 
 
 @router.post("/webhook", tags=["Events"])
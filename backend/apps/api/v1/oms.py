@@ -8,6 +8,7 @@ from django.http import HttpRequest
 from ninja import Query, Router
 
 from apps.api.base import api_controller
+from apps.api.idempotency import run_idempotent
 from apps.api.schemas import (
     ETagHeader,
     IdempotencyKeyHeader,
@@ -43,6 +44,13 @@ from apps.oms.services import (
 router = Router()
 
 
+def _idempotency_scope(operation: str, tenant: Any, user: Any) -> str:
+    """Namespace idempotency keys per operation, tenant and user."""
+    tenant_id = getattr(tenant, "id", None)
+    user_id = getattr(user, "id", None)
+    return f"{operation}:{tenant_id}:{user_id}"
+
+
 @router.get("/orders", response=OrderListResponseSchema, summary="List Orders")
 @api_controller
 def list_orders(
@@ -63,12 +71,14 @@ def list_orders(
     - Status and date range
     """
     service = OrderService(tenant=tenant, user=user)
-    orders, total_count, has_next = service.list_orders(
-        filters=query.dict(exclude_none=True), limit=query.limit, offset=query.offset
+    orders, next_cursor = service.list_orders(
+        filters=query,
+        cursor=query.cursor,
+        page_size=query.page_size,
     )
 
     return OrderListResponseSchema(
-        orders=orders, total_count=total_count, has_next=has_next
+        orders=orders, has_next=next_cursor is not None, next_cursor=next_cursor
     )
 
 
@@ -87,7 +97,7 @@ def create_order(
     Returns the created order with all details.
     """
     service = OrderService(tenant=tenant, user=user)
-    order = service.create_order(payload.dict())
+    order = service.create_order(payload)
 
     return OrderResponseSchema.from_orm(order)
 
@@ -109,13 +119,21 @@ def create_bulk_orders(
     Uses idempotency key to prevent duplicate creation.
     Returns accepted and rejected orders with error details.
     """
-    service = OrderService(tenant=tenant, user=user)
-    result = service.create_bulk_orders(
-        orders=payload.orders, idempotency_key=idempotency_key
-    )
 
-    return BulkOrderResponseSchema(
-        accepted=result["accepted"], rejected=result["rejected"]
+    def create():
+        service = OrderService(tenant=tenant, user=user)
+        result = service.create_bulk_orders(
+            orders=payload.orders, idempotency_key=idempotency_key
+        )
+        return BulkOrderResponseSchema(
+            accepted=result["accepted"], rejected=result["rejected"]
+        )
+
+    return run_idempotent(
+        _idempotency_scope("orders.bulk", tenant, user),
+        idempotency_key,
+        create,
+        BulkOrderResponseSchema,
     )
 
 
@@ -152,9 +170,7 @@ def update_order(
     Only allows updates to certain fields.
     """
     service = OrderService(tenant=tenant, user=user)
-    order = service.update_order(
-        order_id=order_id, updates=payload.dict(exclude_none=True), etag=etag
-    )
+    order = service.update_order(order_id=order_id, payload=payload, etag=etag)
 
     return OrderResponseSchema.from_orm(order)
 
@@ -195,13 +211,21 @@ def cancel_bulk_orders(
     Uses idempotency key to prevent duplicate cancellation.
     Returns accepted and rejected cancellations with error details.
     """
-    service = OrderService(tenant=tenant, user=user)
-    result = service.cancel_bulk_orders(
-        order_ids=payload.order_ids, idempotency_key=idempotency_key
-    )
 
-    return BulkCancelResponseSchema(
-        accepted=result["accepted"], rejected=result["rejected"]
+    def cancel():
+        service = OrderService(tenant=tenant, user=user)
+        result = service.cancel_bulk_orders(
+            order_ids=payload.order_ids, idempotency_key=idempotency_key
+        )
+        return BulkCancelResponseSchema(
+            accepted=result["accepted"], rejected=result["rejected"]
+        )
+
+    return run_idempotent(
+        _idempotency_scope("orders.bulk_cancel", tenant, user),
+        idempotency_key,
+        cancel,
+        BulkCancelResponseSchema,
     )
 
 
@@ -225,12 +249,14 @@ def list_executions(
     - Date range
     """
     service = ExecutionService(tenant=tenant, user=user)
-    executions, total_count, has_next = service.list_executions(
-        filters=query.dict(exclude_none=True), limit=query.limit, offset=query.offset
+    executions, next_cursor = service.list_executions(
+        filters=query,
+        cursor=query.cursor,
+        page_size=query.page_size,
     )
 
     return ExecutionListResponseSchema(
-        executions=executions, total_count=total_count, has_next=has_next
+        executions=executions, has_next=next_cursor is not None, next_cursor=next_cursor
     )
 
 
@@ -271,12 +297,14 @@ def list_positions(
     - Position existence
     """
     service = PositionService(tenant=tenant, user=user)
-    positions, total_count, has_next = service.list_positions(
-        filters=query.dict(exclude_none=True), limit=query.limit, offset=query.offset
+    positions, next_cursor = service.list_positions(
+        filters=query,
+        cursor=query.cursor,
+        page_size=query.page_size,
     )
 
     return PositionListResponseSchema(
-        positions=positions, total_count=total_count, has_next=has_next
+        positions=positions, has_next=next_cursor is not None, next_cursor=next_cursor
     )
 
 
@@ -314,12 +342,14 @@ def list_pnl_snapshots(
     - Date range
     """
     service = PnLService(tenant=tenant, user=user)
-    snapshots, total_count, has_next = service.list_pnl_snapshots(
-        filters=query.dict(exclude_none=True), limit=query.limit, offset=query.offset
+    snapshots, next_cursor = service.list_pnl_snapshots(
+        filters=query,
+        cursor=query.cursor,
+        page_size=query.page_size,
     )
 
     return PnLListResponseSchema(
-        snapshots=snapshots, total_count=total_count, has_next=has_next
+        snapshots=snapshots, has_next=next_cursor is not None, next_cursor=next_cursor
     )
 
 
@@ -4,6 +4,8 @@ System and health check API endpoints.
 
 import platform
 import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from typing import Any
 
 from django.conf import settings
@@ -12,6 +14,8 @@ from django.db import connection
 from django.http import HttpRequest
 from ninja import Router
 
+from apps.core.localcache import TTLCache
+
 try:
     import psutil  # type: ignore
 except Exception:  # pragma: no cover - optional dependency
@@ -19,84 +23,169 @@ except Exception:  # pragma: no cover - optional dependency
 
 router = Router()
 
+# Last /metrics sample, shared by the worker's threads
+_metrics_cache = TTLCache(maxsize=1, ttl=getattr(settings, "SYSTEM_METRICS_TTL", 5))
+
+# Last readiness probe result
+_readiness_cache = TTLCache(maxsize=1, ttl=getattr(settings, "HEALTH_READY_TTL", 2))
+
+# Runs the cache probe alongside the database check; the probe result is
+# awaited for at most HEALTH_CACHE_PROBE_TIMEOUT seconds
+_probe_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="health")
+
+if psutil is not None:
+    # One handle per worker: psutil keeps the previous CPU times on it, so
+    # process.cpu_percent() measures since the last scrape instead of
+    # always returning 0.0 from a fresh handle
+    _PROCESS = psutil.Process()
+    # Prime the CPU counters; the first interval=None call always reports 0.0
+    psutil.cpu_percent(interval=None)
+    _PROCESS.cpu_percent(interval=None)
+
+
+# Static response bodies, built once per process; platform.processor() in
+# particular shells out on some platforms
+_HEALTH_PAYLOAD = {
+    "status": "healthy",
+    "service": "OMS Trading API",
+    "version": "1.0.0",
+    "environment": getattr(settings, "DJANGO_SETTINGS_MODULE", "unknown"),
+}
+
+_VERSION_PAYLOAD = {
+    "service": "OMS Trading API",
+    "version": "1.0.0",
+    "build_date": "2024-01-01T00:00:00Z",  # TODO: Get from build info
+    "git_commit": "unknown",  # TODO: Get from git
+    "python_version": platform.python_version(),
+    "django_version": "5.1.11",
+    "environment": getattr(settings, "DJANGO_SETTINGS_MODULE", "unknown"),
+}
+
+_SYSTEM_INFO_PAYLOAD = {
+    "system": "OMS Trading",
+    "version": "1.0.0",
+    "status": "operational",
+    "platform": platform.platform(),
+    "architecture": platform.architecture()[0],
+    "processor": platform.processor(),
+    "python_implementation": platform.python_implementation(),
+}
+
 
 @router.get("/health", tags=["System"])
 def health_check(request: HttpRequest) -> dict[str, Any]:
     """Basic health check endpoint."""
-    return {
-        "status": "healthy",
-        "service": "OMS Trading API",
-        "version": "1.0.0",
-        "timestamp": time.time(),
-        "environment": getattr(settings, "DJANGO_SETTINGS_MODULE", "unknown"),
-    }
+    return {**_HEALTH_PAYLOAD, "timestamp": time.time()}
 
 
-@router.get("/health/ready", tags=["System"])
-def health_ready(request: HttpRequest) -> dict[str, Any]:
-    """Readiness probe endpoint for Kubernetes/load balancers."""
+def _check_cache() -> bool:
+    # A single read is a full round trip and fails on a dead backend
+    try:
+        cache.get("health_check")
+        return True
+    except Exception:
+        return False
+
+
+def _readiness_checks() -> dict[str, bool]:
     checks = {"database": False, "cache": False, "overall": False}
 
-    # Check database connectivity
+    cache_probe = _probe_executor.submit(_check_cache)
+
+    # Check database connectivity; ensure_connection() alone does not notice
+    # a persistent connection the server has dropped, so is_usable() pings
+    # on the raw driver connection, skipping Django's cursor wrapper
     try:
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT 1")
-            checks["database"] = True
+        connection.ensure_connection()
+        checks["database"] = connection.is_usable()
     except Exception:
         checks["database"] = False
 
-    # Check cache connectivity
+    # A stalled cache reports not ready instead of holding the probe open
     try:
-        cache.set("health_check", "ok", 10)
-        cache.get("health_check")
-        checks["cache"] = True
-    except Exception:
+        checks["cache"] = cache_probe.result(
+            timeout=getattr(settings, "HEALTH_CACHE_PROBE_TIMEOUT", 0.3)
+        )
+    except FutureTimeoutError:
         checks["cache"] = False
 
     # Overall health
     checks["overall"] = all([checks["database"], checks["cache"]])
+    return checks
 
-    status = "ready" if checks["overall"] else "not_ready"
 
-    return {
-        "status": status,
-        "service": "OMS Trading API",
-        "timestamp": time.time(),
-        "checks": checks,
-    }
+@router.get("/health/ready", tags=["System"])
+def health_ready(request: HttpRequest) -> dict[str, Any]:
+    """Readiness probe endpoint for Kubernetes/load balancers.
+
+    The result is reused for HEALTH_READY_TTL seconds so frequent probes do
+    not each hit the database and cache; `timestamp` is when it was checked.
+    """
+    result = _readiness_cache.get("ready")
+    if result is None:
+        checks = _readiness_checks()
+        result = {
+            "status": "ready" if checks["overall"] else "not_ready",
+            "service": "OMS Trading API",
+            "timestamp": time.time(),
+            "checks": checks,
+        }
+        _readiness_cache.set("ready", result)
+    return result
 
 
 @router.get("/version", tags=["System"])
 def version_info(request: HttpRequest) -> dict[str, Any]:
     """Get detailed version information."""
-    return {
-        "service": "OMS Trading API",
-        "version": "1.0.0",
-        "build_date": "2024-01-01T00:00:00Z",  # TODO: Get from build info
-        "git_commit": "unknown",  # TODO: Get from git
-        "python_version": platform.python_version(),
-        "django_version": "5.1.11",
-        "environment": getattr(settings, "DJANGO_SETTINGS_MODULE", "unknown"),
-    }
+    return _VERSION_PAYLOAD
 
 
 @router.get("/info", tags=["System"])
 def system_info(request: HttpRequest) -> dict[str, Any]:
     """Get system information."""
+    return _SYSTEM_INFO_PAYLOAD
+
+
+def _collect_metrics() -> dict[str, Any]:
+    # interval=None compares against the previous call instead of sleeping;
+    # the module primes it at import so the first scrape is meaningful
+    cpu_percent = psutil.cpu_percent(interval=None)
+    memory = psutil.virtual_memory()
+    disk = psutil.disk_usage("/")
+
+    # Process metrics; oneshot() reads /proc/self once for all of them
+    with _PROCESS.oneshot():
+        process_memory = _PROCESS.memory_info()
+        process_metrics = {
+            "memory_rss_mb": round(process_memory.rss / (1024**2), 2),
+            "memory_vms_mb": round(process_memory.vms / (1024**2), 2),
+            "cpu_percent": _PROCESS.cpu_percent(),
+            "num_threads": _PROCESS.num_threads(),
+            "create_time": _PROCESS.create_time(),
+        }
+
     return {
-        "system": "OMS Trading",
-        "version": "1.0.0",
-        "status": "operational",
-        "platform": platform.platform(),
-        "architecture": platform.architecture()[0],
-        "processor": platform.processor(),
-        "python_implementation": platform.python_implementation(),
+        "system": {
+            "cpu_percent": cpu_percent,
+            "memory_percent": memory.percent,
+            "memory_available_gb": round(memory.available / (1024**3), 2),
+            "disk_percent": disk.percent,
+            "disk_free_gb": round(disk.free / (1024**3), 2),
+        },
+        "process": process_metrics,
+        "timestamp": time.time(),
     }
 
 
 @router.get("/metrics", tags=["System"])
 def system_metrics(request: HttpRequest) -> dict[str, Any]:
-    """Get system metrics."""
+    """Get system metrics.
+
+    Samples are reused for SYSTEM_METRICS_TTL seconds, so scrapers polling
+    several workers do not each pay for a fresh round of /proc reads;
+    `timestamp` is when the returned sample was taken.
+    """
     try:
         if psutil is None:
             return {
@@ -104,32 +193,11 @@ def system_metrics(request: HttpRequest) -> dict[str, Any]:
                 "timestamp": time.time(),
             }
 
-        # System metrics
-        cpu_percent = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage("/")
-
-        # Process metrics
-        process = psutil.Process()
-        process_memory = process.memory_info()
-
-        return {
-            "system": {
-                "cpu_percent": cpu_percent,
-                "memory_percent": memory.percent,
-                "memory_available_gb": round(memory.available / (1024**3), 2),
-                "disk_percent": disk.percent,
-                "disk_free_gb": round(disk.free / (1024**3), 2),
-            },
-            "process": {
-                "memory_rss_mb": round(process_memory.rss / (1024**2), 2),
-                "memory_vms_mb": round(process_memory.vms / (1024**2), 2),
-                "cpu_percent": process.cpu_percent(),
-                "num_threads": process.num_threads(),
-                "create_time": process.create_time(),
-            },
-            "timestamp": time.time(),
-        }
+        metrics = _metrics_cache.get("metrics")
+        if metrics is None:
+            metrics = _collect_metrics()
+            _metrics_cache.set("metrics", metrics)
+        return metrics
     except Exception as e:
         return {
             "error": "Failed to collect metrics",
@@ -593,14 +593,14 @@ class TradeManagementView(TemplateView):
         # Fetch active positions (quantity != 0)
         active_positions = (
             Position.objects.exclude(quantity=0)
-            .select_related("instrument", "broker_account")
+            .select_related("instrument")
             .order_by("-last_updated")
         )
 
         # Fetch recent orders
         recent_orders = (
             Order.objects.all()
-            .select_related("instrument", "broker_account")
+            .select_related("instrument")
             .order_by("-created_at")[:100]
         )
 
@@ -2,7 +2,10 @@
 Django admin configuration for broker models.
 """
 
+from functools import cache
+
 from django.contrib import admin
+from django.db.models import Count, Q
 from django.urls import reverse
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
@@ -10,6 +13,93 @@ from django.utils.translation import gettext_lazy as _
 
 from .models import Broker, BrokerAccount, BrokerConnection, BrokerConnectionLog
 
+_URL_ID_PLACEHOLDER = "__id__"
+
+
+@cache
+def _change_url_template(viewname):
+    """Resolve an admin change URL once, leaving a ``%s`` slot for the pk.
+
+    Resolution is deferred to first use because admin modules are imported
+    during autodiscovery, before the URLconf can be loaded.
+    """
+    url = reverse(viewname, args=[_URL_ID_PLACEHOLDER])
+    return url.replace("%", "%%").replace(_URL_ID_PLACEHOLDER, "%s")
+
+
+def _change_link(viewname, pk, label):
+    """Render a link to the admin change page of ``pk``."""
+    return format_html(
+        '<a href="{}">{}</a>', _change_url_template(viewname) % pk, label
+    )
+
+
+def _colored_spans(colors, choices):
+    """Render the color-coded ``<span>`` for every known choice value once."""
+    return {
+        value: format_html(
+            '<span style="color: {};">{}</span>', colors.get(value, "black"), label
+        )
+        for value, label in choices
+    }
+
+
+def _colored_span(value, label, spans):
+    """Return the pre-rendered span for ``value``, rendering unknown values."""
+    html = spans.get(value)
+    if html is None:
+        html = format_html('<span style="color: black;">{}</span>', label)
+    return html
+
+
+_BROKER_TESTING_HTML = mark_safe('<span style="color: orange;">Testing</span>')
+_BROKER_ACTIVE_HTML = mark_safe('<span style="color: green;">Active</span>')
+_BROKER_INACTIVE_HTML = mark_safe('<span style="color: red;">Inactive</span>')
+
+_CONNECTION_STATUS_HTML = _colored_spans(
+    {
+        "CONNECTED": "green",
+        "CONNECTING": "blue",
+        "DISCONNECTED": "gray",
+        "ERROR": "red",
+        "MAINTENANCE": "orange",
+    },
+    BrokerConnection.STATUS_CHOICES,
+)
+
+_ACCOUNT_STATUS_HTML = _colored_spans(
+    {
+        "ACTIVE": "green",
+        "INACTIVE": "gray",
+        "SUSPENDED": "red",
+        "CLOSED": "black",
+        "PENDING": "orange",
+    },
+    BrokerAccount.STATUS_CHOICES,
+)
+
+_LOG_LEVEL_COLORS = {
+    "DEBUG": "gray",
+    "INFO": "blue",
+    "WARNING": "orange",
+    "ERROR": "red",
+    "CRITICAL": "darkred",
+}
+_LOG_LEVEL_HTML = _colored_spans(
+    _LOG_LEVEL_COLORS, [(level, level) for level in _LOG_LEVEL_COLORS]
+)
+
+_BADGE_STYLE = "color: white; padding: 2px 6px; border-radius: 3px; font-size: 10px;"
+_PERMISSION_BADGES = tuple(
+    (field, f'<span style="background: {color}; {_BADGE_STYLE}">{label}</span>')
+    for field, color, label in (
+        ("can_trade_stocks", "green", "Stocks"),
+        ("can_trade_options", "blue", "Options"),
+        ("can_trade_futures", "purple", "Futures"),
+        ("can_trade_forex", "orange", "Forex"),
+    )
+)
+
 
 @admin.register(Broker)
 class BrokerAdmin(admin.ModelAdmin):
@@ -56,24 +146,32 @@ class BrokerAdmin(admin.ModelAdmin):
     def status_display(self, obj):
         """Display broker status with color coding."""
         if obj.is_testing:
-            return format_html('<span style="color: orange;">Testing</span>')
+            return _BROKER_TESTING_HTML
         elif obj.is_active:
-            return format_html('<span style="color: green;">Active</span>')
+            return _BROKER_ACTIVE_HTML
         else:
-            return format_html('<span style="color: red;">Inactive</span>')
+            return _BROKER_INACTIVE_HTML
 
     status_display.short_description = _("Status")
 
     def connection_count(self, obj):
         """Display count of active connections."""
-        count = obj.connections.filter(is_active=True).count()
-        return count
+        return obj._active_conn_count
 
     connection_count.short_description = _("Connections")
+    connection_count.admin_order_field = "_active_conn_count"
 
     def get_queryset(self, request):
-        """Optimize queryset with prefetch_related."""
-        return super().get_queryset(request).prefetch_related("connections")
+        """Annotate active connection counts in the changelist query."""
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(
+                _active_conn_count=Count(
+                    "connections", filter=Q(connections__is_active=True)
+                )
+            )
+        )
 
 
 @admin.register(BrokerConnection)
@@ -160,9 +258,10 @@ class BrokerConnectionAdmin(admin.ModelAdmin):
 
     def broker_name(self, obj):
         """Display broker name with link to broker admin."""
-        if obj.broker:
-            url = reverse("admin:brokers_broker_change", args=[obj.broker.id])
-            return format_html('<a href="{}">{}</a>', url, obj.broker.name)
+        if obj.broker_id:
+            return _change_link(
+                "admin:brokers_broker_change", obj.broker_id, obj.broker.name
+            )
         return "-"
 
     broker_name.short_description = _("Broker")
@@ -170,16 +269,8 @@ class BrokerConnectionAdmin(admin.ModelAdmin):
 
     def status_display(self, obj):
         """Display connection status with color coding."""
-        status_colors = {
-            "CONNECTED": "green",
-            "CONNECTING": "blue",
-            "DISCONNECTED": "gray",
-            "ERROR": "red",
-            "MAINTENANCE": "orange",
-        }
-        color = status_colors.get(obj.status, "black")
-        return format_html(
-            '<span style="color: {};">{}</span>', color, obj.get_status_display()
+        return _colored_span(
+            obj.status, obj.get_status_display(), _CONNECTION_STATUS_HTML
         )
 
     status_display.short_description = _("Status")
@@ -264,11 +355,12 @@ class BrokerAccountAdmin(admin.ModelAdmin):
 
     def broker_connection_name(self, obj):
         """Display broker connection name with link to admin."""
-        if obj.broker_connection:
-            url = reverse(
-                "admin:brokers_brokerconnection_change", args=[obj.broker_connection.id]
+        if obj.broker_connection_id:
+            return _change_link(
+                "admin:brokers_brokerconnection_change",
+                obj.broker_connection_id,
+                obj.broker_connection.name,
             )
-            return format_html('<a href="{}">{}</a>', url, obj.broker_connection.name)
         return "-"
 
     broker_connection_name.short_description = _("Broker Connection")
@@ -276,39 +368,13 @@ class BrokerAccountAdmin(admin.ModelAdmin):
 
     def status_display(self, obj):
         """Display account status with color coding."""
-        status_colors = {
-            "ACTIVE": "green",
-            "INACTIVE": "gray",
-            "SUSPENDED": "red",
-            "CLOSED": "black",
-            "PENDING": "orange",
-        }
-        color = status_colors.get(obj.status, "black")
-        return format_html(
-            '<span style="color: {};">{}</span>', color, obj.get_status_display()
-        )
+        return _colored_span(obj.status, obj.get_status_display(), _ACCOUNT_STATUS_HTML)
 
     status_display.short_description = _("Status")
 
     def permissions_display(self, obj):
         """Display trading permissions as badges."""
-        badges = []
-        if obj.can_trade_stocks:
-            badges.append(
-                '<span style="background: green; color: white; padding: 2px 6px; border-radius: 3px; font-size: 10px;">Stocks</span>'
-            )
-        if obj.can_trade_options:
-            badges.append(
-                '<span style="background: blue; color: white; padding: 2px 6px; border-radius: 3px; font-size: 10px;">Options</span>'
-            )
-        if obj.can_trade_futures:
-            badges.append(
-                '<span style="background: purple; color: white; padding: 2px 6px; border-radius: 3px; font-size: 10px;">Futures</span>'
-            )
-        if obj.can_trade_forex:
-            badges.append(
-                '<span style="background: orange; color: white; padding: 2px 6px; border-radius: 3px; font-size: 10px;">Forex</span>'
-            )
+        badges = [html for field, html in _PERMISSION_BADGES if getattr(obj, field)]
 
         return mark_safe(" ".join(badges)) if badges else "-"
 
@@ -380,11 +446,12 @@ class BrokerConnectionLogAdmin(admin.ModelAdmin):
 
     def broker_connection_name(self, obj):
         """Display broker connection name with link to admin."""
-        if obj.broker_connection:
-            url = reverse(
-                "admin:brokers_brokerconnection_change", args=[obj.broker_connection.id]
+        if obj.broker_connection_id:
+            return _change_link(
+                "admin:brokers_brokerconnection_change",
+                obj.broker_connection_id,
+                obj.broker_connection.name,
             )
-            return format_html('<a href="{}">{}</a>', url, obj.broker_connection.name)
         return "-"
 
     broker_connection_name.short_description = _("Broker Connection")
@@ -392,15 +459,7 @@ class BrokerConnectionLogAdmin(admin.ModelAdmin):
 
     def level_display(self, obj):
         """Display log level with color coding."""
-        level_colors = {
-            "DEBUG": "gray",
-            "INFO": "blue",
-            "WARNING": "orange",
-            "ERROR": "red",
-            "CRITICAL": "darkred",
-        }
-        color = level_colors.get(obj.level, "black")
-        return format_html('<span style="color: {};">{}</span>', color, obj.level)
+        return _colored_span(obj.level, obj.level, _LOG_LEVEL_HTML)
 
     level_display.short_description = _("Level")
 
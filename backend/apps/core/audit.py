@@ -0,0 +1,115 @@
+"""
+Background batching of AuditLog writes.
+
+Request handlers enqueue unsaved AuditLog instances; a daemon thread per
+process drains the queue and inserts them with bulk_create, so audit rows
+no longer add an INSERT round trip to the response. Entries still queued
+when the process is killed without running atexit hooks are lost.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+AUDIT_BATCH_SIZE = 500
+# How long the writer waits for more entries before flushing a batch
+AUDIT_FLUSH_INTERVAL = 0.05
+
+_audit_queue: queue.SimpleQueue = queue.SimpleQueue()
+_writer_pid = None
+_writer_lock = threading.Lock()
+
+
+def enqueue_audit_log(**fields) -> None:
+    """Queue an AuditLog row for a background bulk insert."""
+    from .models import AuditLog
+
+    entry = AuditLog(**fields)
+    if not getattr(settings, "AUDIT_LOG_ASYNC", True):
+        _write_batch([entry])
+        return
+
+    _ensure_writer()
+    _audit_queue.put(entry)
+
+
+def flush_audit_logs() -> None:
+    """Write everything currently queued from the calling thread."""
+    batch = _drain(block=False)
+    while batch:
+        _write_batch(batch)
+        batch = _drain(block=False)
+
+
+def _ensure_writer() -> None:
+    # Threads do not survive fork, so start one per worker process
+    global _writer_pid
+    if _writer_pid == os.getpid():
+        return
+    with _writer_lock:
+        if _writer_pid == os.getpid():
+            return
+        threading.Thread(target=_run_writer, name="audit-writer", daemon=True).start()
+        atexit.register(flush_audit_logs)
+        _writer_pid = os.getpid()
+
+
+def _drain(block: bool) -> list:
+    batch = []
+    try:
+        batch.append(_audit_queue.get(block=block))
+    except queue.Empty:
+        return batch
+
+    deadline = time.monotonic() + AUDIT_FLUSH_INTERVAL
+    while len(batch) < AUDIT_BATCH_SIZE:
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:
+            break
+        try:
+            batch.append(_audit_queue.get(timeout=timeout))
+        except queue.Empty:
+            break
+    return batch
+
+
+def _run_writer() -> None:
+    while True:
+        _write_batch(_drain(block=True))
+        close_old_connections()
+
+
+def _write_batch(batch: list) -> None:
+    if not batch:
+        return
+    from .models import AuditLog
+
+    # Savepoints keep a failed INSERT from breaking an enclosing transaction
+    # (the synchronous path runs inside the request's)
+    try:
+        with transaction.atomic():
+            AuditLog.objects.bulk_create(batch, batch_size=AUDIT_BATCH_SIZE)
+        return
+    except Exception as e:
+        logger.warning(
+            f"Audit batch of {len(batch)} entries failed, retrying one by one: {e}"
+        )
+
+    # Audit rows are compliance data: one bad row must not drop the batch
+    for entry in batch:
+        try:
+            with transaction.atomic():
+                entry.save(force_insert=True)
+        except Exception:
+            logger.exception(
+                f"Failed to write audit log entry {entry.id}: {entry.action} "
+                f"on {entry.resource_type} {entry.resource_id}"
+            )
@@ -0,0 +1,47 @@
+"""
+Per-process TTL cache for memoising hot lookups in front of shared caches.
+"""
+
+import threading
+import time
+from typing import Any
+
+
+class TTLCache:
+    """Thread-safe, size-bounded mapping whose entries expire after `ttl` seconds.
+
+    Eviction is oldest-insertion first. Values are local to the process, so
+    anything cached here must tolerate being stale for up to `ttl` seconds on
+    other workers after an invalidation.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: dict[Any, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return default
+        return entry[1]
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                # Dicts preserve insertion order, so the first key is the oldest
+                self._data.pop(next(iter(self._data)), None)
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -2,12 +2,17 @@
 Core middleware for OMS Trading system.
 """
 
+import copy
 import logging
 import uuid
 
 from django.conf import settings
+from django.contrib.auth import HASH_SESSION_KEY, SESSION_KEY, get_user
 from django.http import HttpRequest
 from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+
+from apps.core.localcache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +37,43 @@ class RequestIDMiddleware:
         return response
 
 
+class UserPrefetchMiddleware:
+    """Middleware that resolves request.user once, cached briefly per session.
+
+    Resolved users are kept in this process only: user instances cannot go
+    through the JSON cache serializer. A cached user is reused only while
+    the session's auth hash still matches it, so a session that was flushed
+    or re-keyed is resolved again. A password changed through another worker
+    is seen here once the entry expires (CACHE_TIMEOUT).
+    """
+
+    # Seconds a resolved session user is reused before hitting the database
+    CACHE_TIMEOUT = 10
+
+    # session key -> user, for this process
+    _local_users = TTLCache(maxsize=10_000, ttl=CACHE_TIMEOUT)
+
+    def __init__(self, get_response=None):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest):
+        """Replace the lazy request.user with a concrete, cached instance."""
+        session = getattr(request, "session", None)
+        if session is not None and session.session_key and SESSION_KEY in session:
+            session_key = session.session_key
+            user = self._local_users.get(session_key)
+            if user is None or not constant_time_compare(
+                session.get(HASH_SESSION_KEY, ""), user.get_session_auth_hash()
+            ):
+                user = get_user(request)
+                if user.is_authenticated:
+                    self._local_users.set(session_key, user)
+            # Hand each request its own instance; the cached one is shared
+            request.user = copy.copy(user) if user.is_authenticated else user
+
+        return self.get_response(request) if self.get_response else None
+
+
 class AuditLogMiddleware:
     """Middleware for automatic audit logging."""
 
@@ -132,7 +174,7 @@ class AuditLogMiddleware:
     ):
         """Log audit trail to database."""
         try:
-            from .models import AuditLog
+            from .audit import enqueue_audit_log
 
             # Get client IP
             ip_address = self._get_client_ip(request)
@@ -143,8 +185,8 @@ class AuditLogMiddleware:
             # Get request ID
             request_id = getattr(request, "request_id", "")
 
-            # Create audit log entry
-            AuditLog.objects.create(
+            # Queue audit log entry for a background bulk insert
+            enqueue_audit_log(
                 user_id=user_id,
                 action=action,
                 resource_type="API_ENDPOINT",
@@ -192,7 +234,7 @@ class AuditLogMiddleware:
         """Get client IP address from request."""
         x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
         if x_forwarded_for:
-            ip = x_forwarded_for.split(",")[0].strip()
-        else:
-            ip = request.META.get("REMOTE_ADDR", "unknown")
-        return ip
+            # First hop only; no list allocation for multi-proxy chains
+            idx = x_forwarded_for.find(",")
+            return (x_forwarded_for[:idx] if idx != -1 else x_forwarded_for).strip()
+        return request.META.get("REMOTE_ADDR", "unknown")
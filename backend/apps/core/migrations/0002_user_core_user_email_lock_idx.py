@@ -0,0 +1,17 @@
+# Generated by Django 5.1.15 on 2026-10-16 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['email'], include=('is_active', 'locked_until'), name='core_user_email_lock_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.15 on 2026-10-16 08:39
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_user_core_user_email_lock_idx"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="user",
+            name="core_user_email_38052c_idx",
+        ),
+    ]
@@ -109,9 +109,15 @@ class User(AbstractUser, BaseModel):
         verbose_name = _("user")
         verbose_name_plural = _("users")
         indexes = [
-            models.Index(fields=["email"]),
             models.Index(fields=["is_active"]),
             models.Index(fields=["created_at"]),
+            # Email lookups, carrying the columns the pre-authenticate lock
+            # check reads (the unique constraint has its own index)
+            models.Index(
+                fields=["email"],
+                include=["is_active", "locked_until"],
+                name="core_user_email_lock_idx",
+            ),
         ]
 
     def __str__(self):
@@ -147,13 +153,16 @@ class User(AbstractUser, BaseModel):
         self.failed_login_attempts += 1
         if self.failed_login_attempts >= 5:  # Lock after 5 failed attempts
             self.locked_until = timezone.now() + timedelta(minutes=30)
-        self.save()
+        self.save(update_fields=["failed_login_attempts", "locked_until", "updated_at"])
 
     def reset_failed_login(self):
         """Reset failed login attempts."""
+        # Nothing to reset on the common path; skip the UPDATE entirely
+        if self.failed_login_attempts == 0 and self.locked_until is None:
+            return
         self.failed_login_attempts = 0
         self.locked_until = None
-        self.save()
+        self.save(update_fields=["failed_login_attempts", "locked_until", "updated_at"])
 
 
 class AuditLog(BaseModel):
@@ -0,0 +1,29 @@
+"""
+Raw Redis access behind the default cache, for commands the cache API lacks.
+"""
+
+from functools import cache
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django_redis import get_redis_connection
+
+
+@cache
+def get_default_redis():
+    """Return the Redis client behind the default cache, or None.
+
+    The backend is decided once per process. Only a non-django-redis cache
+    (LocMem in tests and local development) yields None; Redis errors are
+    raised by the commands themselves and are not mistaken for it.
+    """
+    try:
+        return get_redis_connection("default")
+    except NotImplementedError:
+        return None
+
+
+@receiver(setting_changed)
+def _reset_default_redis(*, setting, **kwargs):
+    if setting == "CACHES":
+        get_default_redis.cache_clear()
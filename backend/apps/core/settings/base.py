@@ -87,6 +87,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.core.middleware.UserPrefetchMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     # Custom middleware
@@ -145,6 +146,14 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing: Argon2 for new hashes; PBKDF2 hashes still verify and
+# are upgraded to Argon2 on the user's next successful login
+PASSWORD_HASHERS = [
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
 LANGUAGE_CODE = "en-us"
@@ -266,6 +275,10 @@ CELERY_BEAT_SCHEDULE = {
         "task": "apps.strategies.tasks.scan_all_instruments",
         "schedule": 300.0,  # Every 5 minutes
     },
+    "flush-api-key-last-used": {
+        "task": "apps.accounts.tasks.flush_api_key_last_used",
+        "schedule": 30.0,  # Every 30 seconds
+    },
 }
 
 # Logging Configuration
@@ -354,7 +367,7 @@ LOGGING = {
 JWT_ALGORITHM = "HS256"
 JWT_SECRET_KEY = env("JWT_SECRET_KEY", default=SECRET_KEY)
 JWT_REFRESH_TOKEN_SECRET_KEY = env("JWT_REFRESH_TOKEN_SECRET_KEY", default=SECRET_KEY)
-JWT_ACCESS_TOKEN_LIFETIME = timedelta(minutes=15)  # 15 minutes
+JWT_ACCESS_TOKEN_LIFETIME = timedelta(minutes=5)  # 5 minutes
 JWT_REFRESH_TOKEN_LIFETIME = timedelta(days=7)  # 7 days
 JWT_ROTATE_REFRESH_TOKENS = True
 JWT_BLACKLIST_AFTER_ROTATION = True
@@ -415,9 +428,33 @@ WEBHOOK_CONFIG = {
 # Rate Limiting Configuration
 RATELIMIT_ENABLE = True
 RATELIMIT_USE_CACHE = "default"
+# "sliding" (exact rolling window), "fixed" (INCR counter, O(1) memory),
+# "reserved" (fixed window spent from per-worker slices of the budget) or
+# "local" (token buckets shared by the workers on one host, no cache hop)
+API_RATE_LIMIT_STRATEGY = "sliding"
+API_RATE_LIMIT_WORKERS = env.int("WEB_CONCURRENCY", default=4)
+API_RATE_LIMIT_SHM_PATH = env(
+    "API_RATE_LIMIT_SHM_PATH",
+    default="/dev/shm/oms_ratelimit",  # noqa: S108 - tmpfs, shared by workers
+)
+API_RATE_LIMIT_SHM_SLOTS = 4096
+
+# Seconds the /metrics snapshot is reused before psutil is sampled again
+SYSTEM_METRICS_TTL = 5
+# Seconds a /health/ready result is reused before the checks run again
+HEALTH_READY_TTL = 2
+# Seconds /health/ready waits on the cache probe before reporting it down
+HEALTH_CACHE_PROBE_TIMEOUT = 0.3
+# Seconds cached read endpoint results (broker list/detail) are served when
+# no write invalidates them first
+API_RESPONSE_CACHE_TTL = 30
 
 # Audit Log Configuration
 AUDIT_LOG_ENABLED = True
+# Write audit rows from a background thread in batches instead of inline
+AUDIT_LOG_ASYNC = True
+# Resource types (e.g. "broker") whose service-level audit entries are skipped
+AUDIT_LOG_DISABLED_RESOURCE_TYPES = []
 AUDIT_LOG_RETENTION_DAYS = 2555  # 7 years for compliance
 
 # File Upload Configuration
@@ -31,6 +31,8 @@ DATABASES = {
             "sslmode": "require",
         },
         "CONN_MAX_AGE": 600,  # 10 minutes connection pooling
+        # Validate a reused connection once per request before handing it out
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
@@ -72,6 +74,10 @@ CACHES = {
                 "max_connections": 50,
                 "retry_on_timeout": True,
             },
+            # Fail fast on a stalled Redis instead of hanging request threads
+            # and readiness probes
+            "SOCKET_CONNECT_TIMEOUT": 0.25,
+            "SOCKET_TIMEOUT": 0.5,
             "COMPRESSOR": "django_redis.compressors.zlib.ZlibCompressor",
             "SERIALIZER": "django_redis.serializers.json.JSONSerializer",
         },
@@ -329,6 +335,17 @@ TIME_ZONE = env("TIME_ZONE", default="America/New_York")  # noqa: F405
 # Performance optimizations
 CONN_MAX_AGE = 600  # 10 minutes
 
+# Server-side parameter binding lets psycopg prepare statements that repeat on
+# a persistent connection (list endpoints, auth lookups), so Postgres skips
+# parse/plan after the threshold. Leave off behind transaction-mode PgBouncer.
+ENABLE_PREPARED_STMT_CACHE = env.bool(  # noqa: F405
+    "ENABLE_PREPARED_STMT_CACHE", default=False
+)
+if ENABLE_PREPARED_STMT_CACHE:
+    DATABASES["default"]["OPTIONS"].update(
+        {"server_side_binding": True, "prepare_threshold": 5}
+    )
+
 # Disable browsable API in production
 REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = [  # noqa: F405
     "rest_framework.renderers.JSONRenderer",
@@ -343,6 +360,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.core.middleware.UserPrefetchMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     # Custom middleware
@@ -162,6 +162,7 @@ RATELIMIT_ENABLE = False
 
 # Audit log configuration for tests
 AUDIT_LOG_ENABLED = False
+AUDIT_LOG_ASYNC = False
 
 # File upload settings for tests
 FILE_UPLOAD_MAX_MEMORY_SIZE = 1024 * 1024  # 1 MB
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.15 on 2026-10-16 08:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("brokers", "0001_initial"),
+        ("oms", "0002_initial"),
+        ("strategies", "0006_signallog_direction"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="execution",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="oms_executi_created_b1518f_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="oms_order_created_8df3ea_idx"
+            ),
+        ),
+    ]
@@ -185,6 +185,15 @@ class Order(BaseModel):
         ("COMPLIANCE_REJECTED", "Compliance Rejected"),
     ]
 
+    # States an order can still be modified or cancelled from
+    ACTIVE_STATES = [
+        "NEW",
+        "PENDING_SUBMIT",
+        "SUBMITTED",
+        "PENDING_CANCEL",
+        "PENDING_REPLACE",
+    ]
+
     # Core Order Information
     broker_account = models.ForeignKey(
         "brokers.BrokerAccount",
@@ -275,6 +284,7 @@ class Order(BaseModel):
             models.Index(fields=["submitted_at"]),
             models.Index(fields=["broker_account", "submitted_at"]),
             models.Index(fields=["instrument", "submitted_at"]),
+            models.Index(fields=["-created_at", "-id"]),
         ]
 
     def __str__(self):
@@ -283,13 +293,7 @@ class Order(BaseModel):
     @property
     def is_active(self):
         """Check if order is in an active state."""
-        return self.state in [
-            "NEW",
-            "PENDING_SUBMIT",
-            "SUBMITTED",
-            "PENDING_CANCEL",
-            "PENDING_REPLACE",
-        ]
+        return self.state in self.ACTIVE_STATES
 
     @property
     def is_filled(self):
@@ -364,6 +368,7 @@ class Execution(BaseModel):
             models.Index(fields=["broker_execution_id"]),
             models.Index(fields=["executed_at"]),
             models.Index(fields=["order", "executed_at"]),
+            models.Index(fields=["-created_at", "-id"]),
         ]
 
     def __str__(self):
@@ -9,7 +9,12 @@ from typing import Any
 from ninja import Field, Schema
 from pydantic import validator
 
-from apps.api.schemas import BaseFilterSchema, DateRangeFilterSchema, StatusFilterSchema
+from apps.api.schemas import (
+    BaseFilterSchema,
+    CursorFilterSchema,
+    DateRangeFilterSchema,
+    StatusFilterSchema,
+)
 
 # =============================================================================
 # INSTRUMENT SCHEMAS
@@ -181,7 +186,7 @@ class OrderResponseSchema(Schema):
     total_value: Decimal | None = Field(description="Total order value")
 
 
-class OrderFilterSchema(StatusFilterSchema, DateRangeFilterSchema):
+class OrderFilterSchema(CursorFilterSchema, StatusFilterSchema, DateRangeFilterSchema):
     """Order filter schema."""
 
     instrument_symbol: str | None = Field(description="Filter by instrument symbol")
@@ -246,7 +251,7 @@ class ExecutionResponseSchema(Schema):
     updated_at: datetime = Field(description="Last update timestamp")
 
 
-class ExecutionFilterSchema(DateRangeFilterSchema):
+class ExecutionFilterSchema(CursorFilterSchema, DateRangeFilterSchema):
     """Execution filter schema."""
 
     order_id: str | None = Field(description="Filter by order ID")
@@ -291,7 +296,7 @@ class PositionResponseSchema(Schema):
     is_flat: bool = Field(description="Whether position is flat")
 
 
-class PositionFilterSchema(BaseFilterSchema):
+class PositionFilterSchema(CursorFilterSchema):
     """Position filter schema."""
 
     instrument_symbol: str | None = Field(description="Filter by instrument symbol")
@@ -340,7 +345,7 @@ class PnLSnapshotResponseSchema(Schema):
     net_pnl: Decimal = Field(description="Net P&L (realized + unrealized)")
 
 
-class PnLFilterSchema(DateRangeFilterSchema):
+class PnLFilterSchema(CursorFilterSchema, DateRangeFilterSchema):
     """P&L filter schema."""
 
     broker_account_id: str | None = Field(description="Filter by broker account")
@@ -376,24 +381,24 @@ class OrderListResponseSchema(Schema):
     """Order list response schema."""
 
     orders: list[OrderResponseSchema] = Field(description="List of orders")
-    total_count: int = Field(description="Total number of orders")
     has_next: bool = Field(description="Whether there are more orders")
+    next_cursor: str | None = Field(description="Cursor for the next page")
 
 
 class ExecutionListResponseSchema(Schema):
     """Execution list response schema."""
 
     executions: list[ExecutionResponseSchema] = Field(description="List of executions")
-    total_count: int = Field(description="Total number of executions")
     has_next: bool = Field(description="Whether there are more executions")
+    next_cursor: str | None = Field(description="Cursor for the next page")
 
 
 class PositionListResponseSchema(Schema):
     """Position list response schema."""
 
     positions: list[PositionResponseSchema] = Field(description="List of positions")
-    total_count: int = Field(description="Total number of positions")
     has_next: bool = Field(description="Whether there are more positions")
+    next_cursor: str | None = Field(description="Cursor for the next page")
 
 
 class PnLListResponseSchema(Schema):
@@ -402,5 +407,5 @@ class PnLListResponseSchema(Schema):
     snapshots: list[PnLSnapshotResponseSchema] = Field(
         description="List of P&L snapshots"
     )
-    total_count: int = Field(description="Total number of snapshots")
     has_next: bool = Field(description="Whether there are more snapshots")
+    next_cursor: str | None = Field(description="Cursor for the next page")
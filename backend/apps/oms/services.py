@@ -4,17 +4,24 @@ OMS services for order management, executions, positions, and P&L.
 
 import logging
 import uuid
+from datetime import datetime
 from decimal import Decimal
+from typing import Any
 
 from django.db import transaction
 from django.utils import timezone
 
+from apps.api.base import DjangoRepository
+from apps.api.exceptions import (
+    ConflictAPIError,
+    NotFoundAPIError,
+    ValidationAPIError,
+)
 from apps.brokers.models import BrokerAccount
-from apps.brokers.services import BrokerService
-from libs.ibsdk.contracts import create_btcusd_contract, create_gbpjpy_contract
-from libs.ibsdk.orders import create_limit_order, create_market_order
+from apps.core.audit import enqueue_audit_log
+from apps.core.models import AuditLog
 
-from .models import Execution, Instrument, Order, Position
+from .models import Execution, Instrument, Order, PnLSnapshot, Position
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +51,9 @@ class OMSService:
             strategy_run=strategy_run,
         )
 
+        # Broker clients pull in ib_insync; import them only when placing orders
+        from apps.brokers.services import BrokerService
+
         try:
             connection_id = broker_account.broker_connection_id
             client = await BrokerService.get_client(connection_id)
@@ -85,6 +95,12 @@ class OMSService:
                 return order
 
             # Handle IB Trades
+            from libs.ibsdk.contracts import (
+                create_btcusd_contract,
+                create_gbpjpy_contract,
+            )
+            from libs.ibsdk.orders import create_limit_order, create_market_order
+
             if instrument.symbol == "GBPJPY":
                 contract = create_gbpjpy_contract()
             elif instrument.symbol == "BTCUSD" or instrument.symbol == "BTC":
@@ -232,21 +248,314 @@ class OMSService:
         pos.save()
 
 
-class OrderService:
-    def __init__(self):
-        pass
+# Keyset-paginated list filters: API filter field -> ORM lookup
+_DATE_RANGE_LOOKUPS = {
+    "start_date": "created_at__gte",
+    "end_date": "created_at__lte",
+}
+
+ORDER_FILTER_LOOKUPS = {
+    **_DATE_RANGE_LOOKUPS,
+    "status": "state",
+    "statuses": "state__in",
+    "instrument_symbol": "instrument__symbol",
+    "broker_account_id": "broker_account_id",
+    "order_type": "order_type",
+    "side": "side",
+    "strategy_run_id": "strategy_run_id",
+}
+
+EXECUTION_FILTER_LOOKUPS = {
+    **_DATE_RANGE_LOOKUPS,
+    "order_id": "order_id",
+    "instrument_symbol": "order__instrument__symbol",
+    "broker_account_id": "order__broker_account_id",
+}
+
+POSITION_FILTER_LOOKUPS = {
+    "instrument_symbol": "instrument__symbol",
+    "broker_account_id": "broker_account_id",
+}
+
+PNL_FILTER_LOOKUPS = {
+    **_DATE_RANGE_LOOKUPS,
+    "broker_account_id": "broker_account_id",
+}
+
+
+def _orm_filters(filters: Any, lookups: dict[str, str]) -> dict[str, Any]:
+    """Read the set filter fields off a filter schema as ORM lookups."""
+    orm_filters = {}
+    for field, lookup in lookups.items():
+        value = getattr(filters, field, None)
+        if value is not None:
+            orm_filters[lookup] = value
+    return orm_filters
+
+
+def _etag_version(etag: str | None) -> datetime | None:
+    """Parse an order ETag (its `updated_at`, optionally quoted or weak)."""
+    if not etag:
+        return None
+    try:
+        return datetime.fromisoformat(etag.strip().removeprefix("W/").strip('"'))
+    except ValueError:
+        raise ValidationAPIError("Invalid ETag")
+
+
+class _KeysetListService:
+    """Shared keyset listing for the OMS read services."""
+
+    # Built once per class; repositories hold no per-request state
+    repository: DjangoRepository
+    filter_lookups: dict[str, str] = {}
+
+    def __init__(self, tenant: Any = None, user: Any = None):
+        self.tenant = tenant
+        self.user = user
+        self.tenant_id = getattr(tenant, "id", None)
+
+    def _list(
+        self, filters: Any, cursor: str | None, page_size: int
+    ) -> tuple[list, str | None]:
+        page = self.repository.list_with_cursor(
+            after=cursor,
+            page_size=page_size,
+            filters=_orm_filters(filters, self.filter_lookups),
+            tenant_id=self.tenant_id,
+        )
+        return page["data"], page["next_cursor"]
+
+
+class OrderService(_KeysetListService):
+    repository = DjangoRepository(Order)
+    filter_lookups = ORDER_FILTER_LOOKUPS
+
+    # Rows per INSERT statement for bulk submissions
+    BULK_CREATE_BATCH_SIZE = 500
+
+    def list_orders(self, filters, cursor=None, page_size=20):
+        return self._list(filters, cursor, page_size)
+
+    def create_order(self, payload) -> Order:
+        """Create a single order straight from the validated create schema."""
+        instrument = Instrument.objects.filter(
+            symbol=payload.instrument_symbol, is_active=True, is_tradable=True
+        ).first()
+        if instrument is None:
+            raise NotFoundAPIError(
+                f"Unknown or untradable instrument {payload.instrument_symbol}"
+            )
+        try:
+            account = BrokerAccount.objects.filter(
+                id=uuid.UUID(payload.broker_account_id), is_active=True
+            ).first()
+        except ValueError:
+            account = None
+        if account is None:
+            raise NotFoundAPIError(
+                f"Unknown broker account {payload.broker_account_id}"
+            )
+
+        return Order.objects.create(
+            broker_account=account,
+            instrument=instrument,
+            client_order_id=f"OMS-{uuid.uuid4().hex[:8]}",
+            order_type=payload.order_type,
+            side=payload.side,
+            quantity=payload.quantity,
+            price=payload.price,
+            stop_price=payload.stop_price,
+            trailing_percent=payload.trailing_percent,
+            time_in_force=payload.time_in_force,
+            state="NEW",
+            notes=payload.notes or "",
+            metadata=payload.metadata or {},
+        )
+
+    def update_order(self, order_id: str, payload, etag: str | None = None) -> Order:
+        """Apply the fields the client sent in one conditional UPDATE.
+
+        The ETag is the order's `updated_at`; when given, the UPDATE only
+        matches an unchanged row, so concurrent writers get a 409 instead of
+        overwriting each other.
+        """
+        updates = {}
+        for field in payload.model_fields_set:
+            value = getattr(payload, field)
+            if value is not None:
+                updates[field] = value
+
+        if updates:
+            # Only active orders can be modified; filled, cancelled and
+            # rejected ones fall through to a 409 like a lost race
+            queryset = Order.objects.filter(id=order_id, state__in=Order.ACTIVE_STATES)
+            version = _etag_version(etag)
+            if version is not None:
+                queryset = queryset.filter(updated_at=version)
+            if not queryset.update(**updates, updated_at=timezone.now()):
+                self._raise_write_miss(
+                    order_id,
+                    "Order was modified by another request or is no longer active",
+                )
+            # QuerySet.update() bypasses the post_save audit signal
+            enqueue_audit_log(
+                user_id=getattr(self.user, "pk", None),
+                action="ORDER_UPDATED",
+                resource_type="Order",
+                resource_id=str(order_id),
+                metadata={"updated_fields": sorted(updates)},
+            )
+
+        return self.repository.get_by_id(order_id)
+
+    def cancel_order(self, order_id: str) -> None:
+        """Request cancellation of an active order with a single UPDATE.
+
+        The order moves to PENDING_CANCEL; the broker sync settles the final
+        state.
+        """
+        now = timezone.now()
+        updated = Order.objects.filter(
+            id=order_id, state__in=Order.ACTIVE_STATES
+        ).update(state="PENDING_CANCEL", updated_at=now)
+        if not updated:
+            self._raise_write_miss(
+                order_id, "Order cannot be cancelled in its current state"
+            )
+        enqueue_audit_log(
+            user_id=getattr(self.user, "pk", None),
+            action="ORDER_UPDATED",
+            resource_type="Order",
+            resource_id=str(order_id),
+            metadata={"new_state": "PENDING_CANCEL"},
+        )
+
+    @staticmethod
+    def _raise_write_miss(order_id: str, conflict_message: str):
+        """A conditional UPDATE matched nothing: missing order or lost race."""
+        if not Order.objects.filter(id=order_id).exists():
+            raise NotFoundAPIError(f"Order with id {order_id} not found")
+        raise ConflictAPIError(conflict_message)
+
+    def create_bulk_orders(self, orders, idempotency_key: str) -> dict[str, list]:
+        """Create a batch of orders with one lookup per relation and batched INSERTs.
+
+        Orders whose instrument or broker account cannot be resolved are
+        returned in `rejected` with their index; the rest are inserted in a
+        single transaction. bulk_create bypasses post_save, so the
+        ORDER_CREATED audit rows the signal would write are inserted
+        alongside.
+        """
+        account_ids = set()
+        for payload in orders:
+            try:
+                account_ids.add(uuid.UUID(payload.broker_account_id))
+            except ValueError:
+                pass
+        accounts = BrokerAccount.objects.filter(
+            id__in=account_ids, is_active=True
+        ).in_bulk()
+        instruments = Instrument.objects.filter(
+            symbol__in={payload.instrument_symbol for payload in orders},
+            is_active=True,
+            is_tradable=True,
+        ).in_bulk(field_name="symbol")
+
+        accepted: list[Order] = []
+        rejected: list[dict[str, Any]] = []
+        for index, payload in enumerate(orders):
+            instrument = instruments.get(payload.instrument_symbol)
+            if instrument is None:
+                rejected.append(
+                    {
+                        "index": index,
+                        "error": f"Unknown or untradable instrument {payload.instrument_symbol}",
+                    }
+                )
+                continue
+            try:
+                account = accounts.get(uuid.UUID(payload.broker_account_id))
+            except ValueError:
+                account = None
+            if account is None:
+                rejected.append(
+                    {
+                        "index": index,
+                        "error": f"Unknown broker account {payload.broker_account_id}",
+                    }
+                )
+                continue
+
+            accepted.append(
+                Order(
+                    broker_account=account,
+                    instrument=instrument,
+                    client_order_id=f"OMS-{uuid.uuid4().hex[:8]}",
+                    order_type=payload.order_type,
+                    side=payload.side,
+                    quantity=payload.quantity,
+                    price=payload.price,
+                    stop_price=payload.stop_price,
+                    trailing_percent=payload.trailing_percent,
+                    time_in_force=payload.time_in_force,
+                    state="NEW",
+                    notes=payload.notes or "",
+                    metadata=payload.metadata or {},
+                )
+            )
+
+        if accepted:
+            audit_logs = [
+                AuditLog(
+                    action="ORDER_CREATED",
+                    resource_type="Order",
+                    resource_id=str(order.id),
+                    metadata={
+                        "order_type": order.order_type,
+                        "side": order.side,
+                        "quantity": str(order.quantity),
+                        "price": str(order.price) if order.price else None,
+                        "instrument_symbol": order.instrument.symbol,
+                        "broker_account": order.broker_account.account_name,
+                        "idempotency_key": idempotency_key,
+                    },
+                )
+                for order in accepted
+            ]
+            with transaction.atomic():
+                Order.objects.bulk_create(
+                    accepted, batch_size=self.BULK_CREATE_BATCH_SIZE
+                )
+                AuditLog.objects.bulk_create(
+                    audit_logs, batch_size=self.BULK_CREATE_BATCH_SIZE
+                )
+
+        logger.info(
+            f"Bulk order submission: {len(accepted)} accepted, {len(rejected)} rejected"
+        )
+        return {"accepted": accepted, "rejected": rejected}
+
+
+class ExecutionService(_KeysetListService):
+    repository = DjangoRepository(Execution)
+    filter_lookups = EXECUTION_FILTER_LOOKUPS
+
+    def list_executions(self, filters, cursor=None, page_size=20):
+        return self._list(filters, cursor, page_size)
 
 
-class ExecutionService:
-    def __init__(self):
-        pass
+class PositionService(_KeysetListService):
+    repository = DjangoRepository(Position)
+    filter_lookups = POSITION_FILTER_LOOKUPS
 
+    def list_positions(self, filters, cursor=None, page_size=20):
+        return self._list(filters, cursor, page_size)
 
-class PositionService:
-    def __init__(self):
-        pass
 
+class PnLService(_KeysetListService):
+    repository = DjangoRepository(PnLSnapshot)
+    filter_lookups = PNL_FILTER_LOOKUPS
 
-class PnLService:
-    def __init__(self):
-        pass
+    def list_pnl_snapshots(self, filters, cursor=None, page_size=20):
+        return self._list(filters, cursor, page_size)
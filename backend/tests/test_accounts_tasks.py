@@ -0,0 +1,91 @@
+import time
+
+import fakeredis
+import pytest
+
+from apps.accounts import tasks
+from apps.accounts.models import ApiKey
+from apps.accounts.services import API_KEY_LAST_USED_HASH
+from apps.accounts.tasks import flush_api_key_last_used
+from apps.core.models import User
+
+FLUSHING_KEY = f"{API_KEY_LAST_USED_HASH}:flushing"
+
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(tasks, "get_default_redis", lambda: client)
+    return client
+
+
+@pytest.fixture
+def api_key():
+    user = User.objects.create_user(email="keys@example.com", password="x" * 12)
+    return ApiKey.create_with_key(user=user, name="CI")
+
+
+@pytest.mark.django_db
+class TestFlushApiKeyLastUsed:
+    """Buffered last-used timestamps reach the database exactly once."""
+
+    def test_flushes_buffered_uses(self, redis_client, api_key):
+        now = int(time.time())
+        redis_client.hset(API_KEY_LAST_USED_HASH, str(api_key.id), now)
+
+        assert flush_api_key_last_used() == 1
+
+        api_key.refresh_from_db()
+        assert int(api_key.last_used_at.timestamp()) == now
+        assert not redis_client.exists(API_KEY_LAST_USED_HASH, FLUSHING_KEY)
+
+    def test_nothing_buffered(self, redis_client):
+        assert flush_api_key_last_used() == 0
+
+    def test_drains_leftover_from_crashed_run(self, redis_client, api_key):
+        earlier = int(time.time()) - 60
+        redis_client.hset(FLUSHING_KEY, str(api_key.id), earlier)
+
+        assert flush_api_key_last_used() == 1
+
+        api_key.refresh_from_db()
+        assert int(api_key.last_used_at.timestamp()) == earlier
+        assert not redis_client.exists(FLUSHING_KEY)
+
+    def test_leftover_is_not_overwritten_by_new_uses(self, redis_client, api_key):
+        other = ApiKey.create_with_key(user=api_key.user, name="Other")
+        now = int(time.time())
+        redis_client.hset(FLUSHING_KEY, str(api_key.id), now - 60)
+        redis_client.hset(API_KEY_LAST_USED_HASH, str(other.id), now)
+
+        assert flush_api_key_last_used() == 2
+
+        api_key.refresh_from_db()
+        other.refresh_from_db()
+        assert int(api_key.last_used_at.timestamp()) == now - 60
+        assert int(other.last_used_at.timestamp()) == now
+
+    def test_failed_update_keeps_timestamps(self, redis_client, api_key, monkeypatch):
+        redis_client.hset(API_KEY_LAST_USED_HASH, str(api_key.id), int(time.time()))
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("database down")
+
+        monkeypatch.setattr(ApiKey.objects, "bulk_update", fail)
+        with pytest.raises(RuntimeError):
+            flush_api_key_last_used()
+
+        assert redis_client.hlen(FLUSHING_KEY) == 1
+
+    def test_overlapping_run_skips(self, redis_client, api_key):
+        redis_client.hset(API_KEY_LAST_USED_HASH, str(api_key.id), int(time.time()))
+        lock = redis_client.lock(f"{API_KEY_LAST_USED_HASH}:lock")
+        lock.acquire()
+
+        assert flush_api_key_last_used() == 0
+        assert redis_client.hlen(API_KEY_LAST_USED_HASH) == 1
+
+    def test_without_redis(self, monkeypatch):
+        monkeypatch.setattr(tasks, "get_default_redis", lambda: None)
+
+        assert flush_api_key_last_used() == 0
@@ -0,0 +1,39 @@
+import logging
+
+import pytest
+
+from apps.core.audit import _write_batch
+from apps.core.models import AuditLog
+
+
+def _entry(resource_id, **fields):
+    return AuditLog(
+        **{
+            "action": "UPDATE",
+            "resource_type": "Order",
+            "resource_id": resource_id,
+            **fields,
+        }
+    )
+
+
+@pytest.mark.django_db
+class TestWriteBatch:
+    """Audit batches are written whole, or row by row when one row fails."""
+
+    def test_batch_is_inserted(self):
+        _write_batch([_entry("1"), _entry("2")])
+
+        assert set(AuditLog.objects.values_list("resource_id", flat=True)) == {"1", "2"}
+
+    def test_bad_row_does_not_drop_the_batch(self, caplog):
+        # NOT NULL violation fails the bulk INSERT for every row
+        bad = _entry("bad", resource_type=None)
+
+        with caplog.at_level(logging.WARNING, logger="apps.core.audit"):
+            _write_batch([_entry("1"), bad, _entry("2")])
+
+        assert set(AuditLog.objects.values_list("resource_id", flat=True)) == {"1", "2"}
+        errors = [r for r in caplog.records if r.levelno == logging.ERROR]
+        assert len(errors) == 1
+        assert str(bad.id) in errors[0].getMessage()
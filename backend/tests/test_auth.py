@@ -0,0 +1,120 @@
+from unittest.mock import patch
+
+import pytest
+from celery.exceptions import Retry
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError
+from django.test import RequestFactory
+
+from apps.accounts.services import AuthService, staged_password_key
+from apps.accounts.tasks import hash_and_save_password
+from apps.api.v1.auth import register_user
+from apps.core.models import User
+
+REGISTRATION = {
+    "email": "trader@example.com",
+    "password": "S3cure-passphrase!",
+    "first_name": "Ada",
+    "last_name": "Lovelace",
+}
+
+
+@pytest.mark.django_db
+class TestRegisterUser:
+    """Registration relies on the email unique constraint for duplicates."""
+
+    def setup_method(self):
+        self.factory = RequestFactory()
+
+    def test_register_creates_user_with_hashed_password(self):
+        body = register_user(self.factory.post("/register"), **REGISTRATION)
+
+        assert body["success"] is True
+        user = User.objects.get(email=REGISTRATION["email"])
+        assert str(user.id) == body["data"]["user_id"]
+        assert user.check_password(REGISTRATION["password"])
+
+    def test_duplicate_email_returns_409(self):
+        register_user(self.factory.post("/register"), **REGISTRATION)
+
+        body, status = register_user(self.factory.post("/register"), **REGISTRATION)
+
+        assert status == 409
+        assert body["success"] is False
+        assert User.objects.filter(email=REGISTRATION["email"]).count() == 1
+
+    def test_short_password_returns_400(self):
+        _, status = register_user(
+            self.factory.post("/register"), **{**REGISTRATION, "password": "short"}
+        )
+
+        assert status == 400
+        assert not User.objects.filter(email=REGISTRATION["email"]).exists()
+
+
+@pytest.mark.django_db
+def test_bulk_create_users_rejects_existing_email():
+    User.objects.create_user(email="taken@example.com", password="S3cure-passphrase!")
+
+    with pytest.raises(ValidationError):
+        AuthService.bulk_create_users(
+            [{"email": "taken@example.com", "password": "S3cure-passphrase!"}]
+        )
+
+    assert User.objects.filter(email="taken@example.com").count() == 1
+
+
+@pytest.mark.django_db
+class TestBulkCreateUsers:
+    """Bulk-created users get their password hashed by a task after commit."""
+
+    ENTRIES = [
+        {"email": "one@example.com", "password": "S3cure-passphrase-1"},
+        {"email": "two@example.com", "password": "S3cure-passphrase-2"},
+    ]
+
+    def test_passwords_hashed_after_commit(self, django_capture_on_commit_callbacks):
+        with (
+            patch("apps.accounts.tasks.hash_and_save_password.delay") as delay,
+            django_capture_on_commit_callbacks(execute=True) as callbacks,
+        ):
+            users = AuthService.bulk_create_users(self.ENTRIES)
+            # Nothing is queued until the INSERT commits
+            delay.assert_not_called()
+
+        assert len(callbacks) == 2
+        for user, entry, call in zip(
+            users, self.ENTRIES, delay.call_args_list, strict=True
+        ):
+            user_id, password_ref = call.args
+            # Only a reference to the password travels in the task arguments
+            assert user_id == str(user.id)
+            assert entry["password"] not in (user_id, password_ref)
+            assert not user.has_usable_password()
+
+            hash_and_save_password(user_id, password_ref)
+
+            user.refresh_from_db()
+            assert user.check_password(entry["password"])
+            assert cache.get(staged_password_key(password_ref)) is None
+
+    def test_failed_save_retries_and_keeps_staged_password(self):
+        user = User.objects.create_user(email="retry@example.com")
+        cache.set(staged_password_key("ref"), "S3cure-passphrase!")
+
+        with (
+            patch.object(User, "save", side_effect=DatabaseError("db down")),
+            pytest.raises(Retry) as retry,
+        ):
+            hash_and_save_password.delay(str(user.id), "ref")
+
+        assert isinstance(retry.value.exc, DatabaseError)
+        # Still staged for the retry
+        assert cache.get(staged_password_key("ref")) == "S3cure-passphrase!"
+
+    def test_missing_staged_password_fails(self):
+        user = User.objects.create_user(email="expired@example.com")
+
+        with pytest.raises(RuntimeError):
+            hash_and_save_password(str(user.id), "expired-ref")
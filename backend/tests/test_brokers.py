@@ -0,0 +1,30 @@
+import warnings
+
+import pytest
+from django.test import RequestFactory
+
+from apps.api.v1.brokers import get_broker
+from apps.brokers.models import Broker
+
+
+@pytest.mark.django_db
+class TestGetBroker:
+    """Cached broker rows serialise the same as freshly read ones."""
+
+    def setup_method(self):
+        self.request = RequestFactory().get("/api/v1/brokers/")
+        self.request.tenant_id = "tenant-1"
+
+    def test_cache_hit_matches_miss(self):
+        broker = Broker.objects.create(name="DERIV", broker_type="DERIV")
+
+        # Pydantic only warns when a field holds the wrong type at dump time
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            miss = get_broker(self.request, str(broker.id))
+            hit = get_broker(self.request, str(broker.id))
+
+            assert hit.model_dump_json() == miss.model_dump_json()
+
+        assert hit.created_at == broker.created_at
+        assert hit.tenant_id == "tenant-1"
@@ -0,0 +1,50 @@
+import threading
+from unittest.mock import Mock
+
+import pytest
+from django.test import RequestFactory, override_settings
+
+from apps.api import ninja_api
+from apps.api.v1 import system
+
+
+@pytest.mark.django_db
+class TestReadiness:
+    """Both readiness endpoints share one bounded set of checks."""
+
+    def test_ready_when_database_and_cache_respond(self):
+        checks = system._readiness_checks()
+
+        assert checks == {"database": True, "cache": True, "overall": True}
+
+    @override_settings(HEALTH_CACHE_PROBE_TIMEOUT=0.05)
+    def test_stalled_cache_times_out_as_not_ready(self, monkeypatch):
+        release = threading.Event()
+        # The cache handle is per thread, so swap the module's reference
+        monkeypatch.setattr(system, "cache", Mock(get=lambda key: release.wait(5)))
+
+        try:
+            checks = system._readiness_checks()
+        finally:
+            release.set()
+
+        assert checks["cache"] is False
+        assert checks["overall"] is False
+
+    def test_cache_error_is_not_ready(self, monkeypatch):
+        failing = Mock(get=Mock(side_effect=ConnectionError("cache down")))
+        monkeypatch.setattr(system, "cache", failing)
+
+        assert system._readiness_checks()["cache"] is False
+
+    def test_root_endpoint_uses_shared_checks(self, monkeypatch):
+        monkeypatch.setattr(
+            ninja_api,
+            "_readiness_checks",
+            lambda: {"database": True, "cache": False, "overall": False},
+        )
+
+        body = ninja_api.health_ready(RequestFactory().get("/api/health/ready"))
+
+        assert body["status"] == "not_ready"
+        assert body["checks"]["cache"] is False
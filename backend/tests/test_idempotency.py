@@ -0,0 +1,87 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from django.core.cache import cache
+
+from apps.api.exceptions import ConflictAPIError
+from apps.api.idempotency import (
+    _IN_PROGRESS,
+    IDEMPOTENCY_TTL,
+    IN_PROGRESS_TTL,
+    run_idempotent,
+)
+from apps.oms.schemas import BulkCancelResponseSchema
+
+SCOPE = "orders.bulk_cancel:tenant:user"
+KEY = "key-1"
+CACHE_KEY = f"idem:{SCOPE}:{KEY}"
+
+
+def _response():
+    return BulkCancelResponseSchema(
+        accepted=["order-1"], rejected=[{"order_id": "order-2", "error": "Filled"}]
+    )
+
+
+class TestRunIdempotent:
+    """Idempotency keys run once, replay their result and can be retried."""
+
+    def test_first_request_runs_and_stores_json(self):
+        func = Mock(return_value=_response())
+
+        result = run_idempotent(SCOPE, KEY, func, BulkCancelResponseSchema)
+
+        assert result == _response()
+        func.assert_called_once()
+        # Stored as plain JSON so the Redis JSON serializer can encode it
+        assert cache.get(CACHE_KEY) == _response().model_dump(mode="json")
+
+    def test_replay_rebuilds_schema_without_running(self):
+        run_idempotent(SCOPE, KEY, _response, BulkCancelResponseSchema)
+        func = Mock()
+
+        result = run_idempotent(SCOPE, KEY, func, BulkCancelResponseSchema)
+
+        assert isinstance(result, BulkCancelResponseSchema)
+        assert result == _response()
+        func.assert_not_called()
+
+    def test_in_progress_key_conflicts(self):
+        cache.add(CACHE_KEY, _IN_PROGRESS, IN_PROGRESS_TTL)
+        func = Mock()
+
+        with pytest.raises(ConflictAPIError):
+            run_idempotent(SCOPE, KEY, func, BulkCancelResponseSchema)
+        func.assert_not_called()
+
+    def test_claim_is_short_lived_and_result_kept(self):
+        with patch("apps.api.idempotency.cache") as mock_cache:
+            mock_cache.add.return_value = True
+
+            run_idempotent(SCOPE, KEY, _response, BulkCancelResponseSchema)
+
+        mock_cache.add.assert_called_once_with(CACHE_KEY, _IN_PROGRESS, IN_PROGRESS_TTL)
+        mock_cache.set.assert_called_once_with(
+            CACHE_KEY, _response().model_dump(mode="json"), IDEMPOTENCY_TTL
+        )
+
+    def test_failure_releases_claim(self):
+        func = Mock(side_effect=RuntimeError("broker down"))
+
+        with pytest.raises(RuntimeError):
+            run_idempotent(SCOPE, KEY, func, BulkCancelResponseSchema)
+
+        assert cache.get(CACHE_KEY) is None
+        # The client may retry with the same key
+        result = run_idempotent(SCOPE, KEY, _response, BulkCancelResponseSchema)
+        assert result == _response()
+
+    def test_keys_are_scoped(self):
+        run_idempotent(SCOPE, KEY, _response, BulkCancelResponseSchema)
+        func = Mock(return_value=BulkCancelResponseSchema(accepted=[], rejected=[]))
+
+        run_idempotent(
+            "orders.bulk_cancel:other:user", KEY, func, BulkCancelResponseSchema
+        )
+
+        func.assert_called_once()
@@ -0,0 +1,114 @@
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from apps.api.exceptions import ConflictAPIError, NotFoundAPIError
+from apps.brokers.models import Broker, BrokerAccount, BrokerConnection
+from apps.core.models import AuditLog, User
+from apps.oms.models import Instrument, Order
+from apps.oms.schemas import OrderUpdateSchema
+from apps.oms.services import OrderService
+
+
+def _update(**fields):
+    """OrderUpdateSchema with every field the client did not send left as None."""
+    return OrderUpdateSchema(
+        **{**dict.fromkeys(OrderUpdateSchema.model_fields), **fields}
+    )
+
+
+@pytest.fixture
+def order():
+    broker = Broker.objects.create(name="DERIV", broker_type="DERIV")
+    connection = BrokerConnection.objects.create(broker=broker, name="Primary")
+    account = BrokerAccount.objects.create(
+        broker_connection=connection, account_number="CR100", account_name="Main"
+    )
+    instrument = Instrument.objects.create(symbol="V75", exchange="DERIV")
+    return Order.objects.create(
+        broker_account=account,
+        instrument=instrument,
+        client_order_id="client-1",
+        order_type="LIMIT",
+        side="BUY",
+        quantity=Decimal("1"),
+        price=Decimal("100"),
+    )
+
+
+@pytest.mark.django_db
+class TestOrderConditionalWrites:
+    """Single-UPDATE writes tell a missing order (404) from a conflict (409)."""
+
+    def test_update_with_current_etag(self, order):
+        service = OrderService()
+
+        updated = service.update_order(
+            str(order.id),
+            _update(price=Decimal("101")),
+            etag=f'"{order.updated_at.isoformat()}"',
+        )
+
+        assert updated.price == Decimal("101")
+        assert updated.updated_at > order.updated_at
+        assert AuditLog.objects.filter(
+            action="ORDER_UPDATED", resource_id=str(order.id)
+        ).exists()
+
+    def test_update_with_stale_etag_conflicts(self, order):
+        service = OrderService()
+        stale = order.updated_at.isoformat()
+        service.update_order(str(order.id), _update(price=Decimal("101")))
+
+        with pytest.raises(ConflictAPIError):
+            service.update_order(
+                str(order.id), _update(price=Decimal("102")), etag=stale
+            )
+
+        order.refresh_from_db()
+        assert order.price == Decimal("101")
+
+    def test_update_filled_order_conflicts(self, order):
+        Order.objects.filter(id=order.id).update(state="FILLED")
+
+        with pytest.raises(ConflictAPIError):
+            OrderService().update_order(str(order.id), _update(price=Decimal("101")))
+
+        order.refresh_from_db()
+        assert order.price == Decimal("100")
+
+    def test_update_audit_records_user(self, order):
+        user = User.objects.create_user(email="trader@example.com", password="x" * 12)
+
+        OrderService(user=user).update_order(
+            str(order.id), _update(price=Decimal("101"))
+        )
+
+        entry = AuditLog.objects.get(action="ORDER_UPDATED", resource_id=str(order.id))
+        assert entry.user_id == user.id
+
+    def test_update_missing_order_is_not_found(self):
+        with pytest.raises(NotFoundAPIError):
+            OrderService().update_order(
+                str(uuid.uuid4()), _update(price=Decimal("101"))
+            )
+
+    def test_cancel_active_order(self, order):
+        OrderService().cancel_order(str(order.id))
+
+        order.refresh_from_db()
+        assert order.state == "PENDING_CANCEL"
+
+    def test_cancel_filled_order_conflicts(self, order):
+        Order.objects.filter(id=order.id).update(state="FILLED")
+
+        with pytest.raises(ConflictAPIError):
+            OrderService().cancel_order(str(order.id))
+
+        order.refresh_from_db()
+        assert order.state == "FILLED"
+
+    def test_cancel_missing_order_is_not_found(self):
+        with pytest.raises(NotFoundAPIError):
+            OrderService().cancel_order(str(uuid.uuid4()))
@@ -0,0 +1,90 @@
+import uuid
+
+import pytest
+from django.utils import timezone
+
+from apps.api.base import DjangoRepository, decode_cursor, encode_cursor
+from apps.api.exceptions import ValidationAPIError
+from apps.oms.models import Instrument
+
+
+def _create_instruments(count):
+    return [
+        Instrument.objects.create(symbol=f"SYM{i}", exchange="DERIV")
+        for i in range(count)
+    ]
+
+
+def _walk(repository, page_size):
+    """Follow next_cursor from the first page to the last."""
+    pages, cursor = [], None
+    while True:
+        page = repository.list_with_cursor(after=cursor, page_size=page_size)
+        pages.append([row.id for row in page["data"]])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    """Keyset pages follow (-created_at, -id) without gaps or repeats."""
+
+    def setup_method(self):
+        self.repository = DjangoRepository(Instrument)
+
+    def test_pages_cover_every_row_once(self):
+        instruments = _create_instruments(5)
+        expected = [
+            i.id for i in sorted(instruments, key=lambda i: (i.created_at, i.id))
+        ][::-1]
+
+        pages = _walk(self.repository, page_size=2)
+
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert [id for page in pages for id in page] == expected
+
+    def test_rows_sharing_created_at_are_split_by_id(self):
+        instruments = _create_instruments(4)
+        Instrument.objects.update(created_at=instruments[0].created_at)
+        expected = sorted((i.id for i in instruments), reverse=True)
+
+        pages = _walk(self.repository, page_size=3)
+
+        assert [id for page in pages for id in page] == expected
+
+    def test_exact_page_has_no_next_cursor(self):
+        _create_instruments(2)
+
+        page = self.repository.list_with_cursor(page_size=2)
+
+        assert len(page["data"]) == 2
+        assert page["next_cursor"] is None
+
+    def test_filters_apply_across_pages(self):
+        _create_instruments(3)
+        Instrument.objects.create(symbol="OTHER", exchange="NYSE")
+
+        pages = _walk(self.repository, page_size=1)
+        filtered = self.repository.list_with_cursor(
+            page_size=10, filters={"exchange": "NYSE"}
+        )
+
+        assert len(pages) == 4
+        assert [row.symbol for row in filtered["data"]] == ["OTHER"]
+
+
+class TestCursorCodec:
+    """Cursors are opaque to clients but must reject tampering cleanly."""
+
+    def test_round_trip(self):
+        created_at, id = timezone.now(), uuid.uuid4()
+
+        assert decode_cursor(encode_cursor(created_at, id)) == (created_at, str(id))
+
+    @pytest.mark.parametrize("cursor", ["not-base64!", "bm90LWEtZGF0ZXxpZA==", "//8="])
+    def test_invalid_cursor_is_a_400(self, cursor):
+        with pytest.raises(ValidationAPIError) as exc_info:
+            decode_cursor(cursor)
+
+        assert exc_info.value.code == 400
@@ -0,0 +1,112 @@
+import fakeredis
+import pytest
+from django.test import override_settings
+
+from apps.api import middleware, throttling
+from apps.api.middleware import RateLimitMiddleware, SharedTokenBucket
+from apps.api.throttling import throttle
+
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    """Run the Lua scripts against an in-memory Redis with a Lua interpreter."""
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(middleware, "get_default_redis", lambda: client)
+    monkeypatch.setattr(throttling, "get_default_redis", lambda: client)
+    # Registered scripts and reservations are bound to the previous client
+    monkeypatch.setattr(middleware, "_scripts", {})
+    monkeypatch.setattr(middleware, "_reservations", {})
+    monkeypatch.setattr(throttling, "_bucket_script", None)
+    return client
+
+
+def _hits(count, endpoint="/api/v1/orders"):
+    limiter = RateLimitMiddleware()
+    return [limiter._check_rate_limit("ip_1.2.3.4", endpoint) for _ in range(count)]
+
+
+class TestRateLimitStrategies:
+    """Every strategy counts down the budget and returns -1 once it is spent."""
+
+    @override_settings(API_RATE_LIMIT=3, API_RATE_LIMIT_STRATEGY="sliding")
+    def test_sliding_window(self, redis_client):
+        assert _hits(4) == [2, 1, 0, -1]
+        # Rejected hits are not recorded in the window
+        assert redis_client.zcard("rl:ip_1.2.3.4:/api/v1/orders") == 3
+
+    @override_settings(API_RATE_LIMIT=3, API_RATE_LIMIT_STRATEGY="sliding")
+    def test_sliding_window_is_per_endpoint(self, redis_client):
+        _hits(3)
+
+        assert _hits(1, endpoint="/api/v1/positions") == [2]
+
+    @override_settings(
+        API_RATE_LIMIT=3, API_RATE_LIMIT_WINDOW=60, API_RATE_LIMIT_STRATEGY="fixed"
+    )
+    def test_fixed_window(self, redis_client):
+        assert _hits(4) == [2, 1, 0, -1]
+        ttl = redis_client.ttl("rlf:ip_1.2.3.4:/api/v1/orders")
+        assert 0 < ttl <= 60
+
+    @override_settings(
+        API_RATE_LIMIT=8,
+        API_RATE_LIMIT_WINDOW=3600,
+        API_RATE_LIMIT_STRATEGY="reserved",
+        API_RATE_LIMIT_WORKERS=1,
+    )
+    def test_reserved_budget(self, redis_client):
+        assert _hits(9) == [7, 6, 5, 4, 3, 2, 1, 0, -1]
+
+    @override_settings(
+        API_RATE_LIMIT=8,
+        API_RATE_LIMIT_WINDOW=3600,
+        API_RATE_LIMIT_STRATEGY="reserved",
+        API_RATE_LIMIT_WORKERS=1,
+    )
+    def test_reserved_claims_slices_not_hits(self, redis_client):
+        _hits(2)
+
+        # Both hits came out of one reserved slice of two
+        (quota_key,) = redis_client.keys("rlq:*")
+        assert int(redis_client.get(quota_key)) == 2
+
+
+class TestThrottle:
+    """Token buckets allow a burst of `capacity`, then report a wait."""
+
+    def test_bucket_allows_capacity_then_waits(self, redis_client):
+        results = [throttle("throttle:login:1.2.3.4", 2, 0.5) for _ in range(3)]
+
+        assert results[:2] == [0, 0]
+        assert results[2] == 2
+
+    def test_buckets_are_independent(self, redis_client):
+        throttle("throttle:login:a", 1, 1)
+
+        assert throttle("throttle:login:b", 1, 1) == 0
+        assert throttle("throttle:login:a", 1, 1) == 1
+
+
+class TestSharedTokenBucket:
+    """Host-local buckets keep colliding keys from draining each other."""
+
+    def test_bucket_drains_then_rejects(self, tmp_path):
+        bucket = SharedTokenBucket(str(tmp_path / "rl.bin"), slots=16)
+
+        assert [bucket.consume("rl:a:/x", 3, 60) for _ in range(4)] == [2, 1, 0, -1]
+
+    def test_colliding_key_gets_its_own_bucket(self, tmp_path):
+        # One slot: every key collides
+        bucket = SharedTokenBucket(str(tmp_path / "rl.bin"), slots=1)
+        for _ in range(3):
+            bucket.consume("rl:a:/x", 3, 60)
+
+        assert bucket.consume("rl:b:/x", 3, 60) == 2
+
+    def test_buckets_are_shared_through_the_file(self, tmp_path):
+        path = str(tmp_path / "rl.bin")
+        first, second = SharedTokenBucket(path, 16), SharedTokenBucket(path, 16)
+
+        first.consume("rl:a:/x", 3, 60)
+
+        assert second.consume("rl:a:/x", 3, 60) == 1
@@ -0,0 +1,35 @@
+import uuid
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.api.base import DjangoRepository
+from apps.api.exceptions import NotFoundAPIError
+from apps.oms.models import Instrument
+
+
+@pytest.mark.django_db
+class TestRepositoryUpdate:
+    """update() writes only the columns it was given, plus updated_at."""
+
+    def setup_method(self):
+        self.repository = DjangoRepository(Instrument)
+
+    def test_update_writes_only_changed_columns(self):
+        instrument = Instrument.objects.create(symbol="V75", exchange="DERIV")
+
+        with CaptureQueriesContext(connection) as queries:
+            updated = self.repository.update(str(instrument.id), {"name": "Vol 75"})
+
+        update_sql = next(q["sql"] for q in queries if q["sql"].startswith("UPDATE"))
+        assert '"name"' in update_sql
+        assert '"updated_at"' in update_sql
+        assert '"symbol"' not in update_sql
+        assert updated.updated_at > instrument.updated_at
+        instrument.refresh_from_db()
+        assert instrument.name == "Vol 75"
+
+    def test_update_missing_entity_is_not_found(self):
+        with pytest.raises(NotFoundAPIError):
+            self.repository.update(str(uuid.uuid4()), {"name": "Vol 75"})
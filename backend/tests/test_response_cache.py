@@ -0,0 +1,50 @@
+import uuid
+from datetime import UTC, datetime
+from decimal import Decimal
+from unittest.mock import Mock
+
+from django.core.cache import cache
+
+from apps.api.response_cache import cached_result, invalidate_namespace
+
+ROW_ID = uuid.uuid4()
+
+
+def _row():
+    return {
+        "id": ROW_ID,
+        "price": Decimal("101.5000"),
+        "created_at": datetime(2024, 1, 2, 3, 4, 5, tzinfo=UTC),
+    }
+
+
+class TestCachedResult:
+    """Cached reads are stored as plain JSON and retired per namespace."""
+
+    def test_result_is_normalised_to_json_types(self):
+        result = cached_result("brokers", "detail", _row)
+
+        assert result == {
+            "id": str(ROW_ID),
+            "price": "101.5000",
+            "created_at": "2024-01-02T03:04:05Z",
+        }
+        _, cached = cache.get("resp:brokers:detail")
+        assert cached == result
+
+    def test_hit_skips_func_and_matches_miss(self):
+        miss = cached_result("brokers", "detail", _row)
+        func = Mock()
+
+        hit = cached_result("brokers", "detail", func)
+
+        func.assert_not_called()
+        assert hit == miss
+
+    def test_invalidate_namespace_recomputes(self):
+        cached_result("brokers", "detail", _row)
+        invalidate_namespace("brokers")
+        func = Mock(return_value={"id": "fresh"})
+
+        assert cached_result("brokers", "detail", func) == {"id": "fresh"}
+        func.assert_called_once()
@@ -0,0 +1,86 @@
+import base64
+import hashlib
+import hmac
+import time
+
+import jwt
+import pytest
+
+from apps.accounts.tokens import decode_hs256, encode_hs256
+
+# Long enough for PyJWT not to warn about HMAC key length
+KEY = b"test-signing-key-" * 3
+
+
+def _sign(signing_input: str) -> str:
+    digest = hmac.new(KEY, signing_input.encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def _payload(**claims):
+    now = int(time.time())
+    return {"user_id": "42", "type": "access", "iat": now, "exp": now + 300, **claims}
+
+
+class TestHS256Codec:
+    """The hand-rolled HS256 codec must stay interchangeable with PyJWT."""
+
+    def test_encoded_token_decodes_with_pyjwt(self):
+        payload = _payload()
+        token = encode_hs256(payload, KEY)
+
+        assert jwt.decode(token, KEY, algorithms=["HS256"]) == payload
+
+    def test_pyjwt_token_decodes(self):
+        payload = _payload()
+        token = jwt.encode(payload, KEY, algorithm="HS256")
+
+        assert decode_hs256(token, KEY) == payload
+
+    def test_header_matches_pyjwt(self):
+        payload = _payload()
+
+        ours = encode_hs256(payload, KEY).split(".")[0]
+        theirs = jwt.encode(payload, KEY, algorithm="HS256").split(".")[0]
+        assert ours == theirs
+
+    def test_bad_signature_rejected(self):
+        token = encode_hs256(_payload(), KEY)
+
+        with pytest.raises(jwt.InvalidSignatureError):
+            decode_hs256(token, b"another-key")
+
+    def test_tampered_payload_rejected(self):
+        header, _, signature = encode_hs256(_payload(), KEY).split(".")
+        forged = encode_hs256(_payload(user_id="1"), KEY).split(".")[1]
+
+        with pytest.raises(jwt.InvalidSignatureError):
+            decode_hs256(f"{header}.{forged}.{signature}", KEY)
+
+    def test_alg_mismatch_rejected(self):
+        # Signed with the HS256 key, but the header claims another algorithm
+        header = jwt.encode(_payload(), KEY, algorithm="HS384").split(".")[0]
+        body = encode_hs256(_payload(), KEY).split(".")[1]
+        signature = _sign(f"{header}.{body}")
+
+        with pytest.raises(jwt.InvalidAlgorithmError):
+            decode_hs256(f"{header}.{body}.{signature}", KEY)
+
+    def test_expired_token_rejected(self):
+        token = encode_hs256(_payload(exp=int(time.time()) - 1), KEY)
+
+        with pytest.raises(jwt.ExpiredSignatureError):
+            decode_hs256(token, KEY)
+
+    def test_missing_required_claim_rejected(self):
+        payload = _payload()
+        del payload["user_id"]
+        token = encode_hs256(payload, KEY)
+
+        with pytest.raises(jwt.MissingRequiredClaimError):
+            decode_hs256(token, KEY, require=("exp", "user_id"))
+
+    @pytest.mark.parametrize("token", ["", "a.b", "a.b.c.d", "not-a-token"])
+    def test_malformed_token_rejected(self, token):
+        with pytest.raises(jwt.InvalidTokenError):
+            decode_hs256(token, KEY)